@@ -0,0 +1,51 @@
+"""
+Benchmark dos algoritmos de clipping de linhas (Liang-Barsky e Cohen-Sutherland), nas versões
+por segmento e em lote, sobre os mesmos conjuntos de segmentos.
+
+Uso (no diretório raiz do projeto):
+    python -m benchmarks.bench_clipping
+"""
+
+import timeit
+
+import numpy as np
+
+from system.basics import Point
+from system.clipping import Clipping
+
+SIZES = (1_000, 10_000, 100_000)
+WINDOW_MIN = Point(-1, -1)
+WINDOW_MAX = Point(1, 1)
+
+
+def clip_one_by_one(algorithm, segments: np.ndarray) -> int:
+    accepted = 0
+    for (x0, y0), (x1, y1) in segments.tolist():
+        if algorithm(WINDOW_MAX, WINDOW_MIN, Point(x0, y0), Point(x1, y1)):
+            accepted += 1
+    return accepted
+
+
+def best_of(func, repeat: int = 3) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    algorithms = (
+        ("Liang-Barsky", Clipping.liam_barsky, Clipping.liang_barsky_batch),
+        ("Cohen-Sutherland", Clipping.cohen_sutherland, Clipping.cohen_sutherland_batch),
+    )
+
+    print(f"{'segmentos':>10} {'algoritmo':>18} {'por segmento (s)':>18} {'lote (s)':>10} {'speedup':>9}")
+    for size in SIZES:
+        # segmentos espalhados em uma área 3x maior que a janela: mistura de aceitos, rejeitados e recortados
+        segments = rng.uniform(-3, 3, (size, 2, 2))
+        for name, single, batch in algorithms:
+            one_by_one = best_of(lambda: clip_one_by_one(single, segments))
+            batched = best_of(lambda: batch(WINDOW_MAX, WINDOW_MIN, segments))
+            print(f"{size:>10} {name:>18} {one_by_one:>18.5f} {batched:>10.5f} {one_by_one / batched:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
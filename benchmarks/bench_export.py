@@ -0,0 +1,159 @@
+"""
+Benchmark da exportação para Wavefront.obj (ObjFileHandler.save), em MB/s, comparando a escrita em fluxo
+(descritores criados um a um e vértices formatados em bloco) com a versão anterior (concatenação de strings),
+sobre cenas de malhas em grade de tamanhos crescentes, e o pico de memória alocada durante cada exportação.
+Os arquivos gerados pelas duas versões devem ser iguais, assim como o .obj exportado depois de uma ida e volta
+pela cena binária (.sgi → objetos → .obj).
+
+Uso (no diretório raiz do projeto):
+    python -m benchmarks.bench_export
+"""
+
+import filecmp
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from system.files import ObjectDescriptor, ObjFileHandler, SceneFileHandler
+from system.objects import GraphicObject, LineSegmentObject, PointObject, WireframeObject
+
+SIZES = (10_000, 100_000, 500_000)  # faces
+SIDE = 100  # grade de SIDE x SIDE quadriláteros por objeto
+
+
+def create_scene(n_faces: int) -> list[WireframeObject]:
+    i, j = np.meshgrid(np.arange(SIDE + 1), np.arange(SIDE + 1), indexing="ij")
+    a = (i[:-1, :-1] * (SIDE + 1) + j[:-1, :-1]).reshape(-1)
+    faces = np.column_stack((a, a + 1, a + SIDE + 2, a + SIDE + 1)).tolist()
+    scene = []
+    for k in range(max(n_faces // SIDE ** 2, 1)):
+        points = np.column_stack((i.reshape(-1) + 0.1 * k, j.reshape(-1) / 3, np.sin(i * j).reshape(-1)))
+        scene.append(WireframeObject(f"grid {k}", points, (0.2, 0.4, 0.6), faces_indexes=faces))
+    return scene
+
+
+def legacy_save(filename: str, scene: list[WireframeObject]):
+    """Exportação anterior: descritores de todos os objetos e os dois arquivos montados em strings"""
+    descriptors = []
+    for obj in scene:
+        descriptor = ObjectDescriptor(obj.name)
+        descriptor.id = obj.id
+        descriptor.color = obj.color
+        descriptor.vertices = [tuple(v) for v in obj.points[:, :3].tolist()]
+        descriptor.faces = [[i - len(obj.points) for i in face] for face in obj._faces_indexes]
+        descriptors.append(descriptor)
+
+    obj_filename = os.path.basename(filename)
+    mtl_filename = obj_filename.replace(".obj", ".mtl")
+    obj_archive_str = f"mtllib {mtl_filename}\n"
+    mtl_archive_str = ""
+    for obj in descriptors:
+        object_name = obj.name.replace(" ", "_")
+        wavefront_str = f"o {object_name}\n"
+        for v in obj.vertices:
+            wavefront_str += f"v {v[0]} {v[1]} {v[2]}\n"
+        wavefront_str += f"usemtl {object_name}_material{obj.id}\n"
+        if obj.points:
+            wavefront_str += "p " + " ".join(str(p) for p in obj.points) + "\n"
+        for line in obj.lines:
+            wavefront_str += "l " + " ".join(str(l) for l in line) + "\n"
+        for face in obj.faces:
+            wavefront_str += "f " + " ".join(str(f) for f in face) + "\n"
+        obj_archive_str += wavefront_str + "\n"
+        mtl_archive_str += obj.get_mtl_str() + "\n"
+
+    with open(filename, "w", encoding="utf-8") as obj_file:
+        obj_file.write(obj_archive_str)
+    with open(os.path.join(os.path.dirname(filename), mtl_filename), "w", encoding="utf-8") as mtl_file:
+        mtl_file.write(mtl_archive_str)
+
+
+def current_save(filename: str, scene: list[WireframeObject]):
+    ObjFileHandler.save(filename, (obj.get_descriptor() for obj in scene))
+
+
+def check_scene_round_trip(directory: str):
+    """
+    Exporta uma cena com pontos, linhas e faces para .obj diretamente e depois de gravá-la e lê-la como .sgi
+    (objetos recriados como na importação): os dois .obj devem ser iguais
+    """
+    scene = create_scene(SIDE ** 2) + [
+        WireframeObject(
+            "wireframe", [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 1)], (0.1, 0.2, 0.3),
+            point_indexes=[3], lines_indexes=[[0, 1, 2, 0]], faces_indexes=[[0, 1, 2, 3]],
+        ),
+        LineSegmentObject("line", [(0, 0, 0), (2, 3, 4)], (0.5, 0.5, 0.5)),
+        PointObject("point", [(5, 6, 7)], (0.0, 1.0, 0.0)),
+    ]
+    direct_filename = os.path.join(directory, "direct", "scene.obj")
+    round_trip_filename = os.path.join(directory, "round_trip", "scene.obj")
+    scene_filename = os.path.join(directory, "round_trip", "scene" + SceneFileHandler.EXTENSION)
+
+
+    def descriptors(objects: list[GraphicObject]):
+        """Descritores numerados pela posição: os objetos recriados recebem novos ids, usados nos materiais"""
+        for position, obj in enumerate(objects):
+            descriptor = obj.get_descriptor()
+            descriptor.id = position
+            yield descriptor
+
+    ObjFileHandler.save(direct_filename, descriptors(scene))
+    SceneFileHandler.save(scene_filename, descriptors(scene))
+    imported = [GraphicObject.get_2d_object(descriptor) for descriptor in SceneFileHandler.iter_read(scene_filename)]
+    ObjFileHandler.save(round_trip_filename, descriptors(imported))
+    assert filecmp.cmp(direct_filename, round_trip_filename, shallow=False), "ida e volta pelo .sgi alterou o .obj"
+
+
+def best_of(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(func) -> float:
+    """Pico de memória alocada (MB) durante a chamada, medido separadamente (tracemalloc deixa tudo mais lento)"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        check_scene_round_trip(directory)
+        print(
+            f"{'faces':>10} {'MB':>8} {'anterior (MB/s)':>16} {'atual (MB/s)':>13} {'speedup':>8} "
+            f"{'pico anterior (MB)':>19} {'pico atual (MB)':>16}"
+        )
+        for size in SIZES:
+            scene = create_scene(size)
+            legacy_filename = os.path.join(directory, "legacy", "scene.obj")
+            current_filename = os.path.join(directory, "current", "scene.obj")
+            os.makedirs(os.path.dirname(legacy_filename), exist_ok=True)
+
+            legacy = best_of(lambda: legacy_save(legacy_filename, scene))
+            current = best_of(lambda: current_save(current_filename, scene))
+            assert filecmp.cmp(legacy_filename, current_filename, shallow=False), "arquivos .obj diferentes"
+            assert filecmp.cmp(
+                legacy_filename.replace(".obj", ".mtl"), current_filename.replace(".obj", ".mtl"), shallow=False
+            ), "arquivos .mtl diferentes"
+
+            megabytes = os.path.getsize(current_filename) / 2 ** 20
+            legacy_peak = peak_memory(lambda: legacy_save(legacy_filename, scene))
+            current_peak = peak_memory(lambda: current_save(current_filename, scene))
+            print(
+                f"{len(scene) * SIDE ** 2:>10} {megabytes:>8.1f} {megabytes / legacy:>16.1f} "
+                f"{megabytes / current:>13.1f} {legacy / current:>7.1f}x {legacy_peak:>19.1f} {current_peak:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
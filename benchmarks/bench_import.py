@@ -0,0 +1,87 @@
+"""
+Benchmark da importação de Wavefront.obj (ObjFileHandler.read) sobre malhas geradas (grades de quadriláteros)
+de tamanhos crescentes, comparando com a resolução de índices anterior (busca linear nos vértices do objeto).
+
+Uso (no diretório raiz do projeto):
+    python -m benchmarks.bench_import
+"""
+
+import os
+import tempfile
+import timeit
+from contextlib import contextmanager
+
+from system.files import ObjFileHandler
+
+SIZES = (1_000, 10_000, 50_000)  # faces
+LEGACY_LIMIT = 10_000  # acima disso a versão anterior leva minutos
+
+
+def legacy_add_vertices_and_get_relative_indexes(vertices, indexes, obj, *_):
+    """Implementação anterior (quadrática por objeto), mantida aqui apenas como referência"""
+    relative_indexes = []
+    for i in indexes:
+        index = int(i)
+        if index > 0:
+            index -= 1
+        vertice = vertices[index]
+        if vertice not in obj.vertices:
+            obj.vertices.append(vertice)
+        relative_indexes.append(obj.vertices.index(vertice))
+    return relative_indexes
+
+
+@contextmanager
+def legacy_reader():
+    current = ObjFileHandler._add_vertices_and_get_relative_indexes
+    ObjFileHandler._add_vertices_and_get_relative_indexes = staticmethod(legacy_add_vertices_and_get_relative_indexes)
+    try:
+        yield
+    finally:
+        ObjFileHandler._add_vertices_and_get_relative_indexes = staticmethod(current)
+
+
+def write_grid_mesh(filename: str, n_faces: int):
+    """Grade de quadriláteros com aproximadamente n_faces faces, em um único objeto"""
+    side = max(int(n_faces ** 0.5), 1)
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write("o grid\n")
+        for i in range(side + 1):
+            for j in range(side + 1):
+                file.write(f"v {i} {j} {(i * j) % 7}\n")
+        for i in range(side):
+            for j in range(side):
+                a = i * (side + 1) + j + 1
+                b = a + side + 1
+                file.write(f"f {a} {a + 1} {b + 1} {b}\n")
+    return side * side
+
+
+def describe(descriptors) -> list:
+    return [(d.name, d.vertices, d.faces, d.lines, d.points, d.color) for d in descriptors]
+
+
+def best_of(func, repeat: int = 3) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'faces':>10} {'anterior (s)':>14} {'atual (s)':>12} {'speedup':>10}")
+        for size in SIZES:
+            filename = os.path.join(directory, f"grid_{size}.obj")
+            n_faces = write_grid_mesh(filename, size)
+            current = best_of(lambda: ObjFileHandler.read(filename))
+
+            if size > LEGACY_LIMIT:
+                print(f"{n_faces:>10} {'-':>14} {current:>12.4f} {'-':>10}")
+                continue
+            with legacy_reader():
+                legacy = best_of(lambda: ObjFileHandler.read(filename), repeat=1)
+                expected = describe(ObjFileHandler.read(filename))
+            assert describe(ObjFileHandler.read(filename)) == expected, "descritores diferentes"
+            print(f"{n_faces:>10} {legacy:>14.4f} {current:>12.4f} {legacy / current:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
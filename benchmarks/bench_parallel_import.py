@@ -0,0 +1,91 @@
+"""
+Benchmark da importação paralela de Wavefront.obj (ObjFileHandler.iter_read_parallel) contra a leitura
+sequencial (ObjFileHandler.read), em MB/s, sobre uma malha gerada com vários objetos, índices negativos e materiais.
+
+Uso (no diretório raiz do projeto):
+    python -m benchmarks.bench_parallel_import [tamanho em MB]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from system.files import ObjFileHandler
+
+DEFAULT_SIZE_MB = 128
+CHUNK_SIZE = 8 * 2 ** 20
+SIDE = 100  # grade de SIDE x SIDE quadriláteros por objeto
+
+
+def write_scene(directory: str, size_mb: int) -> str:
+    """Objetos em grade até o arquivo atingir size_mb; metade das faces usa índices negativos"""
+    with open(os.path.join(directory, "scene.mtl"), "w", encoding="utf-8") as file:
+        file.write("newmtl red\nKd 1 0 0\nnewmtl blue\nKd 0 0 1\n")
+
+    filename = os.path.join(directory, "scene.obj")
+    n_vertices = (SIDE + 1) ** 2
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write("mtllib scene.mtl\n")
+        k = 0
+        while file.tell() < size_mb * 2 ** 20:
+            file.write(f"o grid{k}\nusemtl {'red' if k % 2 else 'blue'}\n")
+            for i in range(SIDE + 1):
+                file.write("".join(f"v {i} {j} {(i * j + k) % 7}.5\n" for j in range(SIDE + 1)))
+            for i in range(SIDE):
+                lines = []
+                for j in range(SIDE):
+                    a = i * (SIDE + 1) + j + 1
+                    b = a + SIDE + 1
+                    if j % 2:
+                        lines.append(f"f {a + k * n_vertices} {a + 1 + k * n_vertices} {b + 1 + k * n_vertices}\n")
+                    else:
+                        lines.append(f"f {a - n_vertices - 1} {a - n_vertices} {b - n_vertices}\n")
+                file.write("".join(lines))
+            k += 1
+    return filename
+
+
+def describe(descriptors) -> list:
+    return [
+        (d.name, np.asarray(d.vertices, dtype=float)[:, :3].tolist(), d.faces, d.lines, d.points, tuple(d.color))
+        for d in descriptors
+    ]
+
+
+def measure(func) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE_MB
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        filename = write_scene(directory, size_mb)
+        megabytes = os.path.getsize(filename) / 2 ** 20
+
+        sequential, expected = measure(lambda: ObjFileHandler.read(filename))
+        expected = describe(expected)
+        print(f"arquivo: {megabytes:.0f} MB, {len(expected)} objetos, {cpus} CPUs")
+        print(f"{'leitor':>20} {'tempo (s)':>10} {'MB/s':>8} {'speedup':>8}")
+        print(f"{'sequencial':>20} {sequential:>10.2f} {megabytes / sequential:>8.1f} {'1.0':>7}x")
+
+        workers = 1
+        while True:
+            elapsed, result = measure(
+                lambda: list(ObjFileHandler.iter_read_parallel(filename, workers, CHUNK_SIZE))
+            )
+            assert describe(result) == expected, "descritores diferentes"
+            label = f"paralelo ({workers})"
+            print(f"{label:>20} {elapsed:>10.2f} {megabytes / elapsed:>8.1f} {sequential / elapsed:>7.1f}x")
+            if workers >= cpus:
+                break
+            workers = min(workers * 2, cpus)
+
+
+if __name__ == "__main__":
+    main()
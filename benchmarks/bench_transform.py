@@ -0,0 +1,49 @@
+"""
+Benchmark de Transformation.transform_points (lista de Point, um matmul por ponto)
+contra Transformation.transform_array (um único matmul sobre o array (N, 4)).
+
+Uso (no diretório raiz do projeto):
+    python -m benchmarks.bench_transform
+"""
+
+import timeit
+
+import numpy as np
+
+from system.basics import Point, to_homogeneous_array
+from system.transform import Transformation
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def legacy_transform_points(points: list[Point], matrix: np.array) -> list[Point]:
+    """Implementação anterior, ponto a ponto, mantida aqui apenas como referência"""
+    result = []
+    for point in points:
+        coord = matrix @ np.array(point.get_homogeneous_matrix())
+        result.append(Point(coord[0, 0], coord[1, 0], coord[2, 0]))
+    return result
+
+
+def best_of(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    matrix = Transformation.get_rotation_about_point(Point(10, 20, 30), 0.3, 0.2, 0.1)
+
+    print(f"{'pontos':>10} {'por ponto (s)':>15} {'array (s)':>12} {'speedup':>10}")
+    for size in SIZES:
+        vertices = to_homogeneous_array(rng.uniform(-1000, 1000, (size, 3)))
+        points = Point.array_to_list(vertices)
+        repeat = 3 if size < 1_000_000 else 1
+
+        legacy = best_of(lambda: legacy_transform_points(points, matrix), repeat)
+        batched = best_of(lambda: Transformation.transform_array(vertices, matrix), max(repeat, 5))
+
+        print(f"{size:>10} {legacy:>15.5f} {batched:>12.5f} {legacy / batched:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
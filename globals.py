@@ -3,6 +3,12 @@ from enum import Enum
 WINDOW_WIDTH = 1125  # 1/3 Menu, 2/3 DrawingArea
 WINDOW_HEIGHT = 750
 VIEWPORT_SIZE = 750
+NORMALIZED_MEMORY_BUDGET = 512 * 2 ** 20  # bytes de buffers normalizados de objetos carregados sob demanda
+LAZY_SCENE_LOADING = True  # objetos de cenas binárias (.sgi) ficam no arquivo mapeado até entrarem na janela
+USE_SCENE_CACHE = True  # importação de .obj grava e reutiliza um cache binário (.sgicache) ao lado do arquivo
+PARALLEL_IMPORT = True  # .obj grandes são lidos em vários processos (ver ObjFileHandler.iter_read_parallel)
+PARALLEL_IMPORT_CHUNK_SIZE = 32 * 2 ** 20  # bytes de texto por bloco; arquivos menores são lidos em sequência
+WRITE_BUFFER_SIZE = 2 ** 20  # buffer dos arquivos exportados (.obj, .mtl e .sgi)
 
 
 class ObjectType(Enum):
@@ -1,16 +1,28 @@
-from typing import Callable
+from typing import Callable, List, Tuple
 
 import cairo
 from gi.repository import Gdk, Gtk
 
 
 class DrawingArea:
+    """
+    Área de desenho com a cena renderizada em uma superfície fora da tela (cache).
+    Eventos de desenho só copiam a superfície para a tela; a cena é redesenhada apenas nas regiões
+    invalidadas com invalidate() (ou inteira, quando nenhuma região é informada).
+    """
+
     _element: Gtk.DrawingArea
     _external_on_draw: Callable[[cairo.Context], None]
+    _surface: cairo.ImageSurface | None
+    _full_redraw: bool
+    _dirty_rects: List[Tuple[int, int, int, int]]  # (x, y, largura, altura) a redesenhar
     _scroll_up: Callable[[], None]
     _scroll_down: Callable[[], None]
 
     def __init__(self, grid: Gtk.Grid, viewport_size):
+        self._surface = None
+        self._full_redraw = True
+        self._dirty_rects = []
         self._element = Gtk.DrawingArea()
         self._element.set_size_request(viewport_size, viewport_size)
         self._element.set_hexpand(True)
@@ -32,16 +44,61 @@ class DrawingArea:
         self._scroll_down = scroll_down
 
     def queue_draw(self):
-        """Força o redesenho da tela"""
+        """Força o redesenho da tela (sem redesenhar a cena: só copia a superfície em cache)"""
         self._element.queue_draw()
 
-    def _on_draw(self, _, context: cairo.Context):
+    def invalidate(self, rect: Tuple[int, int, int, int] | None = None):
+        """
+        Marca a cena para ser redesenhada no próximo evento DRAW.
+
+        Args:
+            rect: região (x, y, largura, altura) em coordenadas do dispositivo; None redesenha a cena inteira
+        """
+        if rect is None:
+            self._full_redraw = True
+            self._dirty_rects.clear()
+            self._element.queue_draw()
+        else:
+            if not self._full_redraw:
+                self._dirty_rects.append(rect)
+            self._element.queue_draw_area(*rect)
+
+    def _on_draw(self, widget, context: cairo.Context):
         """
         Função que executa toda vez que o evento DRAW é disparado.
         O evento pode ser forçado a ser executado utilizando queue_draw() na adição de novos elementos.
         """
+        width, height = widget.get_allocated_width(), widget.get_allocated_height()
+        if self._surface is None or (self._surface.get_width(), self._surface.get_height()) != (width, height):
+            self._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+            self._full_redraw = True
+
+        if self._full_redraw:
+            self._render(None)
+        elif self._dirty_rects:
+            self._render(self._dirty_rects)
+        self._full_redraw = False
+        self._dirty_rects = []
+
+        context.set_source_surface(self._surface, 0, 0)
+        context.paint()
+
+    def _render(self, rects: List[Tuple[int, int, int, int]] | None):
+        """Redesenha a cena na superfície em cache, limitada às regiões `rects` (ou inteira, se None)"""
+        surface_context = cairo.Context(self._surface)
+        if rects is not None:
+            for rect in rects:
+                surface_context.rectangle(*rect)
+            surface_context.clip()
+
+        # superfície transparente: o fundo continua sendo o do tema, como antes do cache
+        surface_context.save()
+        surface_context.set_operator(cairo.OPERATOR_CLEAR)
+        surface_context.paint()
+        surface_context.restore()
+
         if self._external_on_draw:
-            self._external_on_draw(context)
+            self._external_on_draw(surface_context)
 
     def _on_scroll(self, _, event):
         if event.direction == Gdk.ScrollDirection.UP and self._scroll_up:
@@ -0,0 +1,50 @@
+from typing import Callable
+
+from gi.repository import Gtk
+
+
+class ImportProgress:
+    """Barra de progresso e botão de cancelar, visíveis apenas durante uma importação"""
+
+    element: Gtk.Box
+    _progress_bar: Gtk.ProgressBar
+    _cancel_button: Gtk.Button
+    external_on_cancel: Callable[[], None]
+
+    def __init__(self):
+        self.external_on_cancel = None
+        self.element = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        self.element.set_margin_start(5)
+        self.element.set_margin_end(5)
+
+        self._progress_bar = Gtk.ProgressBar()
+        self._progress_bar.set_show_text(True)
+        self._cancel_button = Gtk.Button(label="Cancelar")
+        self._cancel_button.connect("clicked", self._on_cancel)
+
+        self.element.pack_start(self._progress_bar, True, True, 0)
+        self.element.pack_start(self._cancel_button, False, False, 0)
+        self._progress_bar.show()
+        self._cancel_button.show()
+        self.element.set_no_show_all(True)  # o show_all da janela não deve exibir a barra
+
+    def connect_on_cancel(self, on_cancel: Callable[[], None]):
+        self.external_on_cancel = on_cancel
+
+    def start(self, text: str):
+        self._progress_bar.set_fraction(0)
+        self._progress_bar.set_text(text)
+        self._cancel_button.set_sensitive(True)
+        self.element.show()
+
+    def set_fraction(self, fraction: float):
+        self._progress_bar.set_fraction(fraction)
+
+    def finish(self):
+        self.element.hide()
+
+    def _on_cancel(self, _):
+        self._cancel_button.set_sensitive(False)
+        self._progress_bar.set_text("Cancelando...")
+        if self.external_on_cancel:
+            self.external_on_cancel()
@@ -1,6 +1,7 @@
 from gi.repository import Gtk
 
 from gui.drawing_area import DrawingArea
+from gui.import_progress import ImportProgress
 from gui.menu_bar import MenuBar
 from gui.menu_box import MenuBox
 
@@ -8,6 +9,7 @@ from gui.menu_box import MenuBox
 class MainWindow(Gtk.Window):
     menu_box: MenuBox
     drawing_area: DrawingArea
+    import_progress: ImportProgress
 
     def __init__(self, width: int, height: int, drawing_area_size: int):
         Gtk.Window.__init__(self, title="Sistema Gráfico Interativo")
@@ -22,10 +24,12 @@ class MainWindow(Gtk.Window):
         grid.set_column_homogeneous(True)
         self.menu_box = MenuBox(grid)
         self.drawing_area = DrawingArea(grid, drawing_area_size)
+        self.import_progress = ImportProgress()
 
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         vbox.pack_start(self.menu_bar.element, False, False, 0)
         vbox.pack_start(grid, False, False, 0)
+        vbox.pack_start(self.import_progress.element, False, False, 5)
         self.add(vbox)
 
         self.connect("destroy", Gtk.main_quit)
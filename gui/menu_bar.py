@@ -41,6 +41,11 @@ class MenuBar:
         filter_obj.add_pattern("*.obj")
         dialog.add_filter(filter_obj)
 
+        filter_scene = Gtk.FileFilter()
+        filter_scene.set_name("SGI Scene (binary)")
+        filter_scene.add_pattern("*.sgi")
+        dialog.add_filter(filter_scene)
+
         filter_all = Gtk.FileFilter()
         filter_all.set_name("All Files")
         filter_all.add_pattern("*")
@@ -69,6 +74,11 @@ class MenuBar:
         filter_obj.add_pattern("*.obj")
         dialog.add_filter(filter_obj)
 
+        filter_scene = Gtk.FileFilter()
+        filter_scene.set_name("SGI Scene (binary)")
+        filter_scene.add_pattern("*.sgi")
+        dialog.add_filter(filter_scene)
+
         filter_all = Gtk.FileFilter()
         filter_all.set_name("All Files")
         filter_all.add_pattern("*")
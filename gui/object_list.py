@@ -1,4 +1,4 @@
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Tuple
 
 from gi.repository import Gtk
 
@@ -32,6 +32,12 @@ class ObjectList:
         self.listbox.add(self._create_row(item_text, object_id))
         self.listbox.show_all()  # Atualiza a exibição
 
+    def add_items(self, items: List[Tuple[str, int]]):
+        """Adiciona vários itens (texto, id) com uma única atualização da exibição"""
+        for item_text, object_id in items:
+            self.listbox.add(self._create_row(item_text, object_id))
+        self.listbox.show_all()
+
     def set_on_apply_transform(self, on_apply: Callable[[int, Dict[TransformationType, Any]], int]):
         self._on_apply_transform = on_apply
 
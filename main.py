@@ -7,4 +7,5 @@ from sgi import SGI
 
 # fmt: on
 
-SGI().run()
+if __name__ == "__main__":  # os processos da importação paralela (forkserver) importam este módulo
+    SGI().run()
@@ -1,12 +1,16 @@
-from typing import Any, Dict, List, Tuple
+import os
+import threading
+from typing import Any, Callable, Dict, List, Tuple
 
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
-from globals import (VIEWPORT_SIZE, WINDOW_HEIGHT, WINDOW_WIDTH,
+from globals import (LAZY_SCENE_LOADING, PARALLEL_IMPORT, USE_SCENE_CACHE,
+                     VIEWPORT_SIZE, WINDOW_HEIGHT, WINDOW_WIDTH,
                      LineClippingType, ObjectType, TransformationType)
 from gui.main_window import MainWindow
-from system.files import ObjFileHandler
-from system.objects import GraphicObject, Point
+from system.files import ObjFileHandler, SceneFileHandler
+from system.importer import ImportedObject, ImportWorker
+from system.objects import Point
 from system.transform import Transformation
 from system.view import DisplayFile, ViewPort, Window
 from utils import parse_input
@@ -21,6 +25,7 @@ class SGI:
 
     main_window: MainWindow
     display_file: DisplayFile
+    _import_worker: ImportWorker | None  # importação em andamento
 
     def __init__(self):
         self.main_window = MainWindow(WINDOW_WIDTH, WINDOW_HEIGHT, VIEWPORT_SIZE)
@@ -28,6 +33,7 @@ class SGI:
         viewport = ViewPort((VIEWPORT_SIZE, VIEWPORT_SIZE), window)
         transformation = Transformation()
         self.display_file = DisplayFile(viewport, transformation)
+        self._import_worker = None
         self.connect()
 
     def run(self):
@@ -43,6 +49,7 @@ class SGI:
 
         self.main_window.menu_bar.connect_on_import(self.import_objects)
         self.main_window.menu_bar.connect_on_export(self.export_objects)
+        self.main_window.import_progress.connect_on_cancel(self.cancel_import)
 
         drawing_area.connect_on_draw(self.display_file.on_draw)
         drawing_area.connect_scroll_up_down(self.zoom_in, self.zoom_out)
@@ -85,7 +92,7 @@ class SGI:
             self.main_window.menu_box.object_list.add_item(
                 f"{object_type.name}[{name}]", object_id
             )
-            self.main_window.drawing_area.queue_draw()
+            self.main_window.drawing_area.invalidate()
             return 1
         except (ValueError, SyntaxError, AttributeError) as e:
             print(f"Erro ao processar a string: {e}")
@@ -104,66 +111,126 @@ class SGI:
         """
         try:
             Validation.object_transform_input(object_input)
+            old_bounds = self.display_file.get_device_bounds(object_id)
             self.display_file.transform_object(object_id, object_input)
-            self.main_window.drawing_area.queue_draw()
+            new_bounds = self.display_file.get_device_bounds(object_id)
+            # só a região ocupada pelo objeto (antes e depois da transformação) precisa ser redesenhada
+            self.main_window.drawing_area.invalidate(self._union_bounds(old_bounds, new_bounds))
             return 1
         except ValidationError as e:
             print(f"Erro ao validar entradas: {e}")
             return -1  # Para manter a modal aberta no caso de problemas
 
+    @staticmethod
+    def _union_bounds(*bounds: Tuple[int, int, int, int] | None) -> Tuple[int, int, int, int] | None:
+        """União de retângulos (x, y, largura, altura), ignorando os vazios (None)"""
+        bounds = [b for b in bounds if b is not None]
+        if not bounds:
+            return None
+        x0 = min(x for x, _, _, _ in bounds)
+        y0 = min(y for _, y, _, _ in bounds)
+        x1 = max(x + w for x, _, w, _ in bounds)
+        y1 = max(y + h for _, y, _, h in bounds)
+        return x0, y0, x1 - x0, y1 - y0
+
     def import_objects(self, filename: str):
-        try:
-            object_descriptors = ObjFileHandler.read(filename)
-            for obj in object_descriptors:
-                graphic_obj = GraphicObject.get_2d_object(obj)
-                if graphic_obj:
-                    self.display_file.add_object(graphic_obj)
-                    item_text = f"{graphic_obj.type.name}[{obj.name}]"
-                    self.main_window.menu_box.object_list.add_item(
-                        item_text, graphic_obj.id
-                    )
-            self.main_window.drawing_area.queue_draw()
-        except:
-            print("Erro ao importar objetos, arquivo possívelmente inválido.")
+        """
+        Importa o arquivo em segundo plano (ver ImportWorker): a interface continua respondendo, e os objetos são
+        adicionados à cena e à lista em lotes, à medida que são lidos, com o progresso na barra de importação.
+
+        Objetos lidos de uma cena binária (vértices mapeados do arquivo, com caixa envolvente) são adicionados sob
+        demanda se LAZY_SCENE_LOADING: os vértices só são lidos quando o objeto entra na janela.
+        """
+        if self._import_worker is not None:
+            print("Já existe uma importação em andamento.")
+            return
+        self._import_worker = ImportWorker(
+            filename, self._iter_read, GLib.idle_add, self._on_import_batch, self._on_import_finished
+        )
+        self.main_window.import_progress.start(f"Importando {os.path.basename(filename)}")
+        self._import_worker.start()
+
+    def cancel_import(self):
+        """Interrompe a importação em andamento; os objetos já adicionados permanecem na cena"""
+        if self._import_worker is not None:
+            self._import_worker.cancel()
+
+    def _on_import_batch(self, objects: List[ImportedObject], fraction: float):
+        """Adiciona o lote à cena e à lista e atualiza o progresso (lotes vazios só atualizam o progresso)"""
+        self.main_window.import_progress.set_fraction(fraction)
+        if not objects:
+            return
+        items = []
+        for graphic_obj, bounds in objects:
+            lazy = LAZY_SCENE_LOADING and bounds is not None
+            self.display_file.add_object(graphic_obj, lazy, bounds)
+            items.append((f"{graphic_obj.type.name}[{graphic_obj.name}]", graphic_obj.id))
+        self.main_window.menu_box.object_list.add_items(items)
+        self.main_window.drawing_area.invalidate()
+
+    def _on_import_finished(self, cancelled: bool, error: Exception | None):
+        self._import_worker = None
+        self.main_window.import_progress.finish()
+        if error is not None:
+            print(f"Erro ao importar objetos, arquivo possívelmente inválido: {error}")
+        elif cancelled:
+            print("Importação cancelada.")
+
+    @staticmethod
+    def _iter_read(filename: str, progress: Callable[[float], None] = None, cancel_event: threading.Event = None):
+        """
+        Escolhe o leitor pela extensão: cena binária (.sgi) ou Wavefront.obj (com o cache binário e a leitura
+        paralela, se ativos)
+        """
+        if filename.endswith(SceneFileHandler.EXTENSION):
+            return SceneFileHandler.iter_read(filename, progress)
+        if USE_SCENE_CACHE:
+            return SceneFileHandler.iter_read_obj_cached(filename, PARALLEL_IMPORT, progress, cancel_event)
+        if PARALLEL_IMPORT:
+            return ObjFileHandler.iter_read_parallel(filename, progress=progress, cancel_event=cancel_event)
+        return ObjFileHandler.iter_read(filename, progress, cancel_event=cancel_event)
 
     def export_objects(self, filename: str):
-        ObjFileHandler.save(filename, self.display_file.get_object_descriptors())
+        if filename.endswith(SceneFileHandler.EXTENSION):
+            SceneFileHandler.save(filename, self.display_file.iter_object_descriptors())
+        else:
+            ObjFileHandler.save(filename, self.display_file.iter_object_descriptors())
 
     def change_clipping_type(self, new_type: LineClippingType):
         self.display_file.change_clipping_type(new_type)
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def zoom_in(self):
         self.display_file.on_zoom_in()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def zoom_out(self):
         self.display_file.on_zoom_out()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def go_up(self):
         self.display_file.on_up()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def go_left(self):
         self.display_file.on_left()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def go_right(self):
         self.display_file.on_right()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def go_down(self):
         self.display_file.on_down()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def go_front(self):
         self.display_file.on_front()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def go_back(self):
         self.display_file.on_back()
-        self.main_window.drawing_area.queue_draw()
+        self.main_window.drawing_area.invalidate()
 
     def rotate(
             self,
@@ -179,6 +246,6 @@ class SGI:
             a_z = float(angle_z) if angle_z.strip() else 0.0
 
             self.display_file.on_rotate(a_x, a_y, a_z)
-            self.main_window.drawing_area.queue_draw()
+            self.main_window.drawing_area.invalidate()
         except ValueError:
             print("Não foi possível converter entrada para numérico.")
@@ -2,6 +2,10 @@ import numpy as np
 
 
 class Point:
+    """Ponto/vetor 3D avulso. Os objetos guardam seus vértices em arrays, e Point é usado só nas bordas da API."""
+
+    __slots__ = ("_x", "_y", "_z", "ignore")
+
     _x: float
     _y: float
     _z: float
@@ -36,6 +40,21 @@ class Point:
     def __str__(self) -> str:
         return f"Point: x={self._x}, y={self._y}, z={self._z}"
 
+    @classmethod
+    def from_array(cls, coords, ignore: bool = False) -> "Point":
+        """Cria um ponto a partir de uma linha (x, y, z, ...) de um array de vértices"""
+        return cls(float(coords[0]), float(coords[1]), float(coords[2]), bool(ignore))
+
+    @classmethod
+    def array_to_list(cls, vertices: np.ndarray, ignore_mask: np.ndarray = None) -> list["Point"]:
+        """Converte um array (N, 3) ou (N, 4) de vértices em uma lista de pontos"""
+        if ignore_mask is None:
+            return [cls(x, y, z) for x, y, z in vertices[:, :3].tolist()]
+        return [
+            cls(x, y, z, ignore)
+            for (x, y, z), ignore in zip(vertices[:, :3].tolist(), ignore_mask.tolist())
+        ]
+
     def get_homogeneous_matrix(self) -> np.array:
         return np.array([[self._x], [self._y], [self._z], [1.0]])
 
@@ -91,3 +110,31 @@ class Point:
                 + (point1.y - point2.y) ** 2
                 + (point1.z - point2.z) ** 2
         ) ** 0.5
+
+
+def to_homogeneous_array(points) -> np.ndarray:
+    """
+    Converte vértices para um array contíguo (N, 4) de coordenadas homogêneas (float64).
+
+    Args:
+        points: lista de Point, lista de tuplas (x, y) / (x, y, z) ou array (N, 2), (N, 3) ou (N, 4)
+    """
+    if isinstance(points, np.ndarray):
+        array = points
+    elif len(points) == 0:
+        return np.empty((0, 4))
+    elif isinstance(points[0], Point):
+        array = np.array([(p.x, p.y, p.z) for p in points], dtype=np.float64)
+    else:
+        array = np.array(points, dtype=np.float64)
+
+    if array.size == 0:
+        return np.empty((0, 4))
+    array = array.reshape(len(array), -1)
+    if array.shape[1] == 4:
+        return np.ascontiguousarray(array, dtype=np.float64)
+
+    result = np.zeros((len(array), 4))
+    result[:, : array.shape[1]] = array
+    result[:, 3] = 1.0
+    return result
@@ -0,0 +1,208 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from system.objects import GraphicObject
+from system.transform import Transformation
+
+
+class SceneBuffer:
+    """
+    Buffer de vértices da cena: guarda os pontos do mundo de todos os objetos em um único array (N, 4),
+    junto com o buffer normalizado e a máscara de pontos ignorados. Cada objeto é um intervalo
+    (offset, tamanho) desses arrays e lê seus pontos como fatias (views, sem cópia).
+    As caixas envolventes normalizadas ficam em uma tabela (objetos, 4), uma linha por objeto.
+    """
+
+    _world: np.ndarray
+    _normalized: np.ndarray
+    _ignore: np.ndarray
+    _bboxes: np.ndarray
+    _size: int  # quantidade de linhas utilizadas (incluindo intervalos descartados)
+    _garbage: int  # linhas de intervalos descartados, recuperadas em compact()
+    _slices: Dict[int, Tuple[int, int]]
+    _rows: Dict[int, int]  # linha de cada objeto na tabela de caixas envolventes
+    _objects: Dict[int, GraphicObject]
+    _layout: Tuple[np.ndarray, np.ndarray, np.ndarray] | None  # (offsets, tamanhos, linhas), ordenado por offset
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._allocate(capacity)
+        self._bboxes = np.empty((64, 4))
+        self._size = 0
+        self._garbage = 0
+        self._slices = {}
+        self._rows = {}
+        self._objects = {}
+        self._layout = None
+
+    def __len__(self):
+        return self._size - self._garbage
+
+    def __contains__(self, obj: GraphicObject):
+        return obj.id in self._slices
+
+    @property
+    def world(self) -> np.ndarray:
+        return self._world[: self._size]
+
+    @property
+    def normalized(self) -> np.ndarray:
+        return self._normalized[: self._size]
+
+    @property
+    def ignore_mask(self) -> np.ndarray:
+        return self._ignore[: self._size]
+
+    def get_slice(self, obj: GraphicObject) -> Tuple[int, int]:
+        return self._slices[obj.id]
+
+    def add(self, obj: GraphicObject):
+        """Copia os pontos do objeto para o fim do buffer e faz o objeto apontar para as fatias correspondentes"""
+        if len(self._rows) == len(self._bboxes):
+            bboxes = self._bboxes
+            self._bboxes = np.empty((2 * len(bboxes), 4))
+            self._bboxes[: len(bboxes)] = bboxes
+            self._bind_all()
+        self._objects[obj.id] = obj
+        self._rows[obj.id] = len(self._rows)
+        self._append(obj, obj.points)
+
+    def update_points(self, obj: GraphicObject, new_points: np.ndarray):
+        """Atualiza os pontos do objeto. Se o tamanho mudar, o objeto é movido para o fim do buffer."""
+        offset, length = self._slices[obj.id]
+        if len(new_points) == length:
+            obj.update_points(new_points)  # escreve direto na fatia do buffer
+            return
+
+        self._garbage += length
+        self._append(obj, new_points)
+        if self._garbage > self._size // 2:
+            self.compact()
+
+    def normalize(self, transformation: Transformation, objects: List[GraphicObject] = None) -> bool:
+        """
+        Normaliza e projeta a cena inteira com uma única multiplicação de matrizes.
+        Se `objects` for informado, só as linhas desses objetos são normalizadas (também em uma única operação),
+        a não ser que eles representem mais da metade da cena.
+
+        Returns:
+            verdadeiro se a cena inteira foi normalizada
+        """
+        if objects is None or 2 * sum(self._slices[obj.id][1] for obj in objects) > len(self):
+            transformation.normalize_array(self.world, self.normalized, self.ignore_mask)
+            self._update_bboxes()
+            return True
+        if not objects:
+            return False
+
+        offsets = np.array([self._slices[obj.id][0] for obj in objects], dtype=np.intp)
+        lengths = np.array([self._slices[obj.id][1] for obj in objects], dtype=np.intp)
+        rows = np.array([self._rows[obj.id] for obj in objects], dtype=np.intp)
+
+        # índices de todas as linhas dos objetos, concatenadas: offset do objeto + posição dentro dele
+        starts = np.cumsum(lengths) - lengths
+        indexes = np.repeat(offsets - starts, lengths) + np.arange(lengths.sum())
+        normalized, ignore = transformation.normalize_array(self._world[indexes])
+        self._normalized[indexes] = normalized
+        self._ignore[indexes] = ignore
+
+        padded = np.concatenate((normalized[:, :2], np.zeros((1, 2))))  # reduceat não aceita índice == tamanho
+        self._store_bboxes(padded, starts, lengths, rows)
+        return False
+
+    def _update_bboxes(self):
+        """Atualiza as caixas envolventes de todos os objetos com uma redução por intervalo (reduceat)"""
+        if not self._slices:
+            return
+        offsets, lengths, rows = self._get_layout()
+        # há sempre uma linha sobrando depois de _size (ver _append)
+        self._store_bboxes(self._normalized[: self._size + 1, :2], offsets, lengths, rows)
+
+    def _store_bboxes(self, xy: np.ndarray, offsets: np.ndarray, lengths: np.ndarray, rows: np.ndarray):
+        """
+        Reduz xy nos intervalos [offset, offset + tamanho) e guarda as caixas nas linhas `rows` da tabela.
+        xy precisa de uma linha a mais depois do último intervalo.
+        """
+        # limites intercalados [início0, fim0, início1, fim1, ...]: as posições pares são os objetos,
+        # as ímpares são os intervalos entre eles (descartados)
+        bounds = np.empty(2 * len(offsets), dtype=np.intp)
+        bounds[0::2] = offsets
+        bounds[1::2] = offsets + lengths
+        mins = np.minimum.reduceat(xy, bounds, axis=0)[0::2]
+        maxs = np.maximum.reduceat(xy, bounds, axis=0)[0::2]
+
+        empty = lengths == 0
+        mins[empty] = np.inf
+        maxs[empty] = -np.inf
+        self._bboxes[rows, :2] = mins
+        self._bboxes[rows, 2:] = maxs
+
+    def _get_layout(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._layout is None:
+            order = sorted(self._slices.items(), key=lambda item: item[1][0])
+            offsets = np.array([offset for _, (offset, _) in order], dtype=np.intp)
+            lengths = np.array([length for _, (_, length) in order], dtype=np.intp)
+            rows = np.array([self._rows[obj_id] for obj_id, _ in order], dtype=np.intp)
+            self._layout = (offsets, lengths, rows)
+        return self._layout
+
+    def compact(self):
+        """Remove os intervalos descartados, mantendo a ordem dos objetos"""
+        order = sorted(self._slices.items(), key=lambda item: item[1][0])
+        used = self._size - self._garbage
+        world, normalized, ignore = self._world, self._normalized, self._ignore
+        self._allocate(used + 1)
+
+        offset = 0
+        for obj_id, (old_offset, length) in order:
+            self._world[offset: offset + length] = world[old_offset: old_offset + length]
+            self._normalized[offset: offset + length] = normalized[old_offset: old_offset + length]
+            self._ignore[offset: offset + length] = ignore[old_offset: old_offset + length]
+            self._slices[obj_id] = (offset, length)
+            offset += length
+
+        self._size = used
+        self._garbage = 0
+        self._layout = None
+        self._bind_all()
+
+    def _append(self, obj: GraphicObject, points: np.ndarray):
+        length = len(points)
+        if self._size + length >= len(self._world):  # sempre sobra uma linha (ver _update_bboxes)
+            self._grow(self._size + length + 1)
+
+        offset = self._size
+        self._world[offset: offset + length] = points
+        self._ignore[offset: offset + length] = False
+        self._size += length
+        self._slices[obj.id] = (offset, length)
+        self._layout = None
+        self._bind(obj)
+
+    def _allocate(self, capacity: int):
+        self._world = np.zeros((capacity, 4))
+        self._normalized = np.zeros((capacity, 4))
+        self._ignore = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, required: int):
+        """Realoca os arrays (capacidade dobrada) e refaz as fatias de todos os objetos"""
+        world, normalized, ignore = self._world, self._normalized, self._ignore
+        self._allocate(max(required, 2 * len(world)))
+        self._world[: self._size] = world[: self._size]
+        self._normalized[: self._size] = normalized[: self._size]
+        self._ignore[: self._size] = ignore[: self._size]
+        self._bind_all()
+
+    def _bind(self, obj: GraphicObject):
+        offset, length = self._slices[obj.id]
+        end = offset + length
+        obj.bind_buffers(
+            self._world[offset:end],
+            self._normalized[offset:end],
+            self._ignore[offset:end],
+            self._bboxes[self._rows[obj.id]],
+        )
+
+    def _bind_all(self):
+        for obj_id in self._slices:
+            self._bind(self._objects[obj_id])
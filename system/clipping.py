@@ -1,4 +1,4 @@
-from math import inf
+import numpy as np
 
 from globals import LineClippingType
 from system.basics import Point
@@ -14,12 +14,37 @@ class Clipping:
     def clip_point(max_p: Point, min_p: Point, point: Point):
         return (min_p.x <= point.x <= max_p.x) and (min_p.y <= point.y <= max_p.y)
 
+    @staticmethod
+    def box_outside(max_p: Point, min_p: Point, bbox) -> bool:
+        """bbox: (min_x, min_y, max_x, max_y). Verdadeiro se a caixa está inteiramente fora da janela"""
+        return bbox[0] > max_p.x or bbox[2] < min_p.x or bbox[1] > max_p.y or bbox[3] < min_p.y
+
+    @staticmethod
+    def box_inside(max_p: Point, min_p: Point, bbox) -> bool:
+        """bbox: (min_x, min_y, max_x, max_y). Verdadeiro se a caixa está inteiramente dentro da janela"""
+        return bbox[0] >= min_p.x and bbox[2] <= max_p.x and bbox[1] >= min_p.y and bbox[3] <= max_p.y
+
     def clip_line(self, max_p: Point, min_p: Point, point1: Point, point2: Point) -> tuple[Point, Point]:
         if LineClippingType.LIANG_BARSKY == self.line_type:
             return Clipping.liam_barsky(max_p, min_p, point1, point2)
         else:
             return Clipping.cohen_sutherland(max_p, min_p, point1, point2)
 
+    def clip_lines(self, max_p: Point, min_p: Point, segments: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Recorta vários segmentos de uma vez.
+
+        Args:
+            segments: array (M, 2, 2) com os extremos [[x0, y0], [x1, y1]] de cada segmento
+
+        Returns:
+            (segmentos recortados (M, 2, 2), máscara (M,) dos segmentos aceitos)
+        """
+        if LineClippingType.LIANG_BARSKY == self.line_type:
+            return Clipping.liang_barsky_batch(max_p, min_p, segments)
+        else:
+            return Clipping.cohen_sutherland_batch(max_p, min_p, segments)
+
     # line clipping
 
     @staticmethod
@@ -60,6 +85,31 @@ class Clipping:
 
             return (Point(x0_clip, y0_clip), Point(x1_clip, y1_clip))
 
+    @staticmethod
+    def liang_barsky_batch(max_p: Point, min_p: Point, segments: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Liang-Barsky aplicado a todos os segmentos (M, 2, 2) de uma vez"""
+        start = segments[:, 0, :]
+        delta = segments[:, 1, :] - start
+        dx, dy = delta[:, 0], delta[:, 1]
+        x0, y0 = start[:, 0], start[:, 1]
+
+        p = np.stack([-dx, dx, -dy, dy], axis=1)
+        q = np.stack([x0 - min_p.x, max_p.x - x0, y0 - min_p.y, max_p.y - y0], axis=1)
+
+        parallel = p == 0
+        # paralela e fora da janela
+        reject = np.any(parallel & (q < 0), axis=1)
+
+        u = q / np.where(parallel, 1.0, p)
+        u1 = np.where(p < 0, u, 0.0).max(axis=1, initial=0.0)
+        u2 = np.where(p > 0, u, 1.0).min(axis=1, initial=1.0)
+        accept = ~reject & (u1 <= u2)
+
+        clipped = np.empty((len(segments), 2, 2))
+        clipped[:, 0, :] = start + u1[:, np.newaxis] * delta
+        clipped[:, 1, :] = start + u2[:, np.newaxis] * delta
+        return clipped, accept
+
     @staticmethod
     def compute_cs_code(max_p: Point, min_p: Point, point1: Point):
         # atribuição de códigos
@@ -130,85 +180,97 @@ class Clipping:
 
         return result
 
-    # Sutherland-Hodgeman
     @staticmethod
-    def clip_polygon(points: list[Point], max_p: Point, min_p: Point):
-        # Deve transformar os pontos em linhas da face
-        n_points = len(points)
-        clipped_lines = [(points[i], points[(i + 1) % n_points]) for i in range(n_points)]
-        clipped_lines_temp = []
-        # Fazer para cada borda
-        for edge in ["l", "r", "t", "b"]:
-            for line in clipped_lines:
-                first_inside = Clipping.is_inside(line[0], max_p, min_p, edge)
-                second_inside = Clipping.is_inside(line[1], max_p, min_p, edge)
-
-                if first_inside and second_inside:
-                    clipped_lines_temp.append(line)
-                elif first_inside:
-                    intersection = Clipping.intersection(line, max_p, min_p, "first", edge)
-                    clipped_lines_temp.append(intersection)
-                elif second_inside:
-                    intersection = Clipping.intersection(line, max_p, min_p, "second", edge)
-                    clipped_lines_temp.append(intersection)
-
-            n_temp_lines = len(clipped_lines_temp)
-            for i in range(n_temp_lines):
-                if i < len(clipped_lines_temp) - 1:
-                    if clipped_lines_temp[i][1] != clipped_lines_temp[i + 1][0]:
-                        clipped_lines_temp.insert(i + 1,
-                                                  [clipped_lines_temp[i][1], clipped_lines_temp[i + 1][0]])
-                else:
-                    if clipped_lines_temp[i][1] != clipped_lines_temp[0][0]:
-                        clipped_lines_temp.append([clipped_lines_temp[i][1], clipped_lines_temp[0][0]])
-
-            clipped_lines = clipped_lines_temp.copy()
-            clipped_lines_temp.clear()
-
-        return clipped_lines
+    def compute_cs_codes(max_p: Point, min_p: Point, points: np.ndarray) -> np.ndarray:
+        """Códigos de região (mesmos bits de compute_cs_code) para um array (K, 2) de pontos"""
+        x, y = points[..., 0], points[..., 1]
+        codes = np.where(x < min_p.x, 0b0001, np.where(x > max_p.x, 0b0010, 0b0000))
+        codes |= np.where(y < min_p.y, 0b0100, np.where(y > max_p.y, 0b1000, 0b0000))
+        return codes
 
     @staticmethod
-    def is_inside(point: Point, max_p: Point, min_p: Point, edge: str):
-        match edge:
-            case "l":
-                return point.x > min_p.x
-            case "r":
-                return point.x < max_p.x
-            case "t":
-                return point.y < max_p.y
-            case "b":
-                return point.y > min_p.y
+    def cohen_sutherland_batch(max_p: Point, min_p: Point, segments: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cohen-Sutherland aplicado a todos os segmentos (M, 2, 2) de uma vez: aceita e rejeita trivialmente em
+        bloco e só itera sobre os segmentos ambíguos restantes, até que não sobre nenhum.
+        """
+        clipped = segments.astype(np.float64, copy=True)
+        codes = Clipping.compute_cs_codes(max_p, min_p, clipped)  # (M, 2)
+        accept = np.zeros(len(segments), dtype=bool)
+        active = np.arange(len(segments))
+
+        while len(active):
+            code1, code2 = codes[active, 0], codes[active, 1]
+            inside = (code1 | code2) == 0b0000  # completamente contida na janela
+            outside = (code1 & code2) != 0b0000  # completamente fora da janela
+            accept[active[inside]] = True
+
+            ambiguous = ~(inside | outside)
+            active = active[ambiguous]
+            code1, code2 = code1[ambiguous], code2[ambiguous]
+
+            region_out_code = np.where(code2 > code1, code2, code1)
+            which = np.where(region_out_code == code1, 0, 1)  # extremo que será substituído
+
+            x1, y1 = clipped[active, 0, 0], clipped[active, 0, 1]
+            dx = clipped[active, 1, 0] - x1
+            dy = clipped[active, 1, 1] - y1
+
+            above = (region_out_code & 0b1000) != 0
+            below = ~above & ((region_out_code & 0b0100) != 0)
+            right = ~above & ~below & ((region_out_code & 0b0010) != 0)  # senão, à esquerda
+
+            # divisões por zero só aparecem em ramos descartados pelo np.where
+            with np.errstate(divide="ignore", invalid="ignore"):
+                boundary_y = np.where(above, max_p.y, min_p.y)
+                boundary_x = np.where(right, max_p.x, min_p.x)
+                vertical = above | below
+                x = np.where(vertical, x1 + dx * (boundary_y - y1) / dy, boundary_x)
+                y = np.where(vertical, boundary_y, y1 + dy * (boundary_x - x1) / dx)
+
+            clipped[active, which, 0] = x
+            clipped[active, which, 1] = y
+            codes[active, which] = Clipping.compute_cs_codes(max_p, min_p, np.column_stack((x, y)))
+
+        return clipped, accept
 
+    # Sutherland-Hodgeman
     @staticmethod
-    def intersection(line: tuple[Point], max_p: Point, min_p: Point, which_inside: str, edge: str):
-        """ which point: first | second """
-
-        angular_coeff = inf
-        if (line[1].x - line[0].x) != 0:
-            angular_coeff = (line[1].y - line[0].y) / (line[1].x - line[0].x)
-
-        if which_inside == "first":
-            point = line[0]
-        else:
-            point = line[1]
-
-        match edge:
-            case "l":
-                new_x = min_p.x
-                new_y = angular_coeff * (min_p.x - point.x) + point.y
-            case "r":
-                new_x = max_p.x
-                new_y = angular_coeff * (max_p.x - point.x) + point.y
-            case "t":
-                new_x = point.x + (1.0 / angular_coeff) * (max_p.y - point.y)
-                new_y = max_p.y
-            case "b":
-                new_x = point.x + (1.0 / angular_coeff) * (min_p.y - point.y)
-                new_y = min_p.y
-
-        new_point = Point(new_x, new_y)
-
-        if which_inside == "first":
-            return (line[0], new_point)
-        else:
-            return (new_point, line[1])
+    def clip_polygon(vertices: np.ndarray, max_p: Point, min_p: Point) -> np.ndarray:
+        """
+        Recorta um polígono contra cada borda da janela (esquerda, direita, topo e base).
+
+        Args:
+            vertices: array (N, 2) com os vértices do polígono, em ordem
+
+        Returns:
+            array (K, 2) com os vértices do polígono recortado (vazio se estiver fora da janela)
+        """
+        vertices = np.asarray(vertices, dtype=np.float64)[:, :2]
+        # (eixo, limite, sentido): o lado de dentro da borda é sentido * (coordenada - limite) > 0
+        edges = ((0, min_p.x, 1), (0, max_p.x, -1), (1, max_p.y, -1), (1, min_p.y, 1))
+
+        for axis, bound, direction in edges:
+            if len(vertices) == 0:
+                break
+            previous = np.roll(vertices, 1, axis=0)
+            distance = direction * (vertices[:, axis] - bound)
+            previous_distance = direction * (previous[:, axis] - bound)
+            inside = distance > 0
+            crossing = inside != (previous_distance > 0)
+
+            # interseção paramétrica da aresta (anterior -> atual) com a borda
+            t = np.divide(
+                previous_distance,
+                previous_distance - distance,
+                out=np.zeros_like(distance),
+                where=crossing,
+            )
+            intersections = previous + t[:, np.newaxis] * (vertices - previous)
+            intersections[:, axis] = bound
+
+            # para cada vértice: [interseção, se a aresta cruza a borda] + [vértice, se está dentro]
+            candidates = np.stack((intersections, vertices), axis=1)
+            vertices = candidates[np.column_stack((crossing, inside))]
+
+        return vertices
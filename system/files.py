@@ -1,8 +1,42 @@
-from typing import List, Tuple
-
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from itertools import chain
+from multiprocessing import shared_memory
+from typing import IO, Callable, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+import io
+import mmap
+import multiprocessing
 import os
+import struct
+import threading
+
+import numpy as np
+
+from globals import PARALLEL_IMPORT_CHUNK_SIZE, WRITE_BUFFER_SIZE
+from system.basics import Point, to_homogeneous_array
+
+
+class PackedPolylines:
+    """
+    Polilinhas no formato da cena binária: offsets (L + 1,) e índices concatenados, em geral views do arquivo
+    mapeado em memória (ver SceneFileHandler). As listas de índices só são criadas sob demanda (ver tolist).
+    """
+
+    offsets: np.ndarray
+    indexes: np.ndarray
+
+    def __init__(self, offsets: np.ndarray, indexes: np.ndarray):
+        self.offsets = offsets
+        self.indexes = indexes
 
-from system.basics import Point
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def tolist(self) -> List[List[int]]:
+        indexes = self.indexes.tolist()
+        bounds = self.offsets.tolist()
+        return [indexes[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
 
 
 class ObjectDescriptor:
@@ -10,10 +44,13 @@ class ObjectDescriptor:
 
     id: int
     name: str
-    vertices: List[Tuple[float, float, float]]
-    faces = List[Tuple[int, ...]]
-    lines = List[Tuple[int, ...]]
-    points = List[int]
+    vertices: List[Tuple[float, float, float]] | np.ndarray  # array (N, 4) se lido de cena binária ou em paralelo
+    faces = List[Tuple[int, ...]] | PackedPolylines  # PackedPolylines se lido de cena binária, assim como lines
+    lines = List[Tuple[int, ...]] | PackedPolylines
+    points = List[int] | np.ndarray  # array (P,) se lido de cena binária
+    bounds: np.ndarray | None  # (min_x, min_y, min_z, max_x, max_y, max_z), quando lido de uma cena binária
+
+    _WRITE_BLOCK_SIZE = 2 ** 16  # linhas formatadas por vez na exportação
 
     def __init__(self, name: str):
         self.id = None
@@ -23,32 +60,51 @@ class ObjectDescriptor:
         self.lines = []
         self.points = []
         self.color = (1, 0, 0)  # DEFAULT VALUE
+        self.bounds = None
 
     @staticmethod
     def vertices_to_points(vertices: List[Tuple[float, float, float]]) -> List[Point]:
         return [Point(v[0], v[1], v[2]) for v in vertices]
 
     def get_wavefront_str(self) -> str:
-        object_name = self.name.replace(" ", "_")
-        wavefront_str = f"o {object_name}\n"
-        for v in self.vertices:
-            wavefront_str += f"v {v[0]} {v[1]} {v[2]}\n"
+        buffer = io.StringIO()
+        self.write_wavefront(buffer)
+        return buffer.getvalue()
 
-        wavefront_str += f"usemtl {object_name}_material{self.id}\n"
+    def write_wavefront(self, file: TextIO):
+        """Escreve o objeto no arquivo, formatando os vértices e elementos em blocos (ver _write_elements)"""
+        object_name = self.name.replace(" ", "_")
+        file.write(f"o {object_name}\n")
+        vertices = self.vertices[:, :3] if isinstance(self.vertices, np.ndarray) else self.vertices
+        self._write_elements(file, "v", vertices)
 
-        if self.points:
-            p_string = "p " + " ".join(str(p) for p in self.points)
-            wavefront_str += p_string + "\n"
+        file.write(f"usemtl {object_name}_material{self.id}\n")
 
-        for line in self.lines:
-            l_string = "l " + " ".join(str(l) for l in line)
-            wavefront_str += l_string + "\n"
+        if len(self.points):
+            file.write("p " + " ".join(map(str, self.points)) + "\n")
 
-        for face in self.faces:
-            f_string = "f " + " ".join(str(f) for f in face)
-            wavefront_str += f_string + "\n"
+        self._write_elements(file, "l", self.lines)
+        self._write_elements(file, "f", self.faces)
 
-        return wavefront_str
+    @staticmethod
+    def _write_elements(file: TextIO, prefix: str, elements: List[Tuple] | np.ndarray):
+        """
+        Escreve uma linha "prefixo n1 n2 ..." por elemento, em blocos de _WRITE_BLOCK_SIZE linhas. Quando todos os
+        elementos têm o mesmo tamanho (vértices, malhas de triângulos), cada bloco é um único str.format.
+        """
+        if len(elements) == 0:
+            return
+        length = len(elements[0])
+        uniform = length > 0 and (isinstance(elements, np.ndarray) or all(len(e) == length for e in elements))
+        for start in range(0, len(elements), ObjectDescriptor._WRITE_BLOCK_SIZE):
+            block = elements[start:start + ObjectDescriptor._WRITE_BLOCK_SIZE]
+            if isinstance(block, np.ndarray):
+                block = block.tolist()
+            if uniform:
+                template = (prefix + " {}" * length + "\n") * len(block)
+                file.write(template.format(*chain.from_iterable(block)))
+            else:
+                file.write("".join([prefix + " " + " ".join(map(str, e)) + "\n" for e in block]))
 
     def get_mtl_str(self) -> str:
         mtl_str = f'newmtl {self.name.replace(" ", "_")}_material{self.id}\n'
@@ -57,91 +113,457 @@ class ObjectDescriptor:
         return mtl_str
 
 
+@contextmanager
+def atomic_write(filename: str, mode: str = "w", **kwargs) -> Iterator[IO]:
+    """
+    Abre um arquivo temporário ao lado de `filename` e o renomeia para `filename` só se a escrita terminar sem erro:
+    quem lê o arquivo nunca vê uma versão pela metade, e uma falha mantém a versão anterior.
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_filename, mode, buffering=WRITE_BUFFER_SIZE, **kwargs) as file:
+            yield file
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        if os.path.exists(temporary_filename):
+            os.remove(temporary_filename)
+        raise
+
+
 class ObjFileHandler:
     """Lida com o formato Wavefront.obj para o SGI"""
 
+    _ELEMENT_KINDS = {"f": 0, "l": 1, "p": 2}  # tipos de elemento na leitura paralela (ver _parse_chunk)
+    _PROGRESS_LINES = 2 ** 14  # linhas lidas entre dois avisos de progresso (ver iter_read)
+    _CANCEL_POLL_INTERVAL = 0.1  # segundos entre verificações de cancelamento durante a leitura paralela
+
     @staticmethod
-    def save(filename: str, object_list: List[ObjectDescriptor]):
+    def save(filename: str, object_list: Iterable[ObjectDescriptor]):
+        """
+        Escreve o .obj e o .mtl à medida que os objetos chegam (object_list pode ser um gerador, ver
+        DisplayFile.iter_object_descriptors), com escrita atômica dos dois arquivos (ver atomic_write)
+        """
         obj_filename = os.path.basename(filename)
         mtl_filename = obj_filename.replace(".obj", ".mtl")
-
-        obj_archive_str = f"mtllib {mtl_filename}\n"
-        mtl_archive_str = ""
-        for obj in object_list:
-            obj_archive_str += obj.get_wavefront_str() + "\n"
-            mtl_archive_str += obj.get_mtl_str() + "\n"
-
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-
-        with open(filename, "w", encoding="utf-8") as obj_file:
-            obj_file.write(obj_archive_str)
-
         mtl_file_path = os.path.join(os.path.dirname(filename), mtl_filename)
-        with open(mtl_file_path, "w", encoding="utf-8") as mtl_file:
-            mtl_file.write(mtl_archive_str)
+
+        with (
+            atomic_write(filename, encoding="utf-8") as obj_file,
+            atomic_write(mtl_file_path, encoding="utf-8") as mtl_file,
+        ):
+            obj_file.write(f"mtllib {mtl_filename}\n")
+            for obj in object_list:
+                obj.write_wavefront(obj_file)
+                obj_file.write("\n")
+                mtl_file.write(obj.get_mtl_str() + "\n")
 
     @staticmethod
     def read(filename: str) -> List[ObjectDescriptor]:
+        return list(ObjFileHandler.iter_read(filename))
+
+    @staticmethod
+    def iter_read(
+            filename: str,
+            progress: Callable[[float], None] = None,
+            on_mtllib: Callable[[str], None] = None,
+            cancel_event: threading.Event = None,
+    ) -> Iterator[ObjectDescriptor]:
+        """
+        Lê o arquivo linha a linha e produz cada objeto assim que o seu bloco `o` termina (no início do próximo
+        objeto ou no fim do arquivo), sem carregar o arquivo inteiro em memória.
+
+        progress: recebe a fração do arquivo já lida (de 0 a 1), a cada _PROGRESS_LINES linhas
+        on_mtllib: recebe o caminho de cada arquivo de materiais (.mtl) usado (ver SceneFileHandler: cache)
+        cancel_event: interrompe a leitura quando marcado (verificado com o progresso)
+        """
         try:
-            with open(filename, "r", encoding="utf-8") as file:
-                content = file.readlines()
+            file = open(filename, "r", encoding="utf-8")
         except Exception as e:
             print(f"Erro ao abrir o arquivo: {e}")
-            return []
+            return
 
         obj_directory = os.path.dirname(filename)
         materials = {}
-        object_descriptors = []
         vertices = []
         current_object = None
+        # índices do objeto atual: índice global -> local e vértice -> local
+        # (ver _add_vertices_and_get_relative_indexes)
+        global_to_local = {}
+        vertex_to_local = {}
+
+        with file:
+            size = max(os.fstat(file.fileno()).st_size, 1)
+            read_size = 0
+            for line_number, line in enumerate(file):
+                read_size += len(line)  # caracteres, não bytes: suficiente para o progresso
+                if line_number % ObjFileHandler._PROGRESS_LINES == 0:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                    if progress is not None:
+                        progress(min(read_size / size, 1.0))
+                split_by_comment = line.split("#")
+                before_comment = split_by_comment[0]
+                if not before_comment:
+                    continue
+                parts = before_comment.split()
+                if not parts:
+                    continue
+                prefix = parts[0]
+
+                match prefix:
+                    case "mtllib":
+                        for filename in parts[1:]:
+                            mtl_file_path = os.path.join(obj_directory, filename)
+                            if on_mtllib is not None:
+                                on_mtllib(mtl_file_path)
+                            new_materials = ObjFileHandler.process_mtllib(mtl_file_path)
+                            materials.update(new_materials)
+                    case "o":
+                        if current_object is not None:
+                            yield current_object  # o objeto anterior está completo
+                        object_name = parts[1]
+                        current_object = ObjectDescriptor(object_name)
+                        global_to_local = {}
+                        vertex_to_local = {}
+                    case "usemtl":
+                        material_name = parts[1]
+                        material = materials[material_name]
+                        if material and material["Kd"]:
+                            current_object.color = material["Kd"]
+                    case "v":
+                        x, y, z = map(float, parts[1:4])
+                        vertices.append((x, y, z))
+                    case "f":
+                        indexes = [part.split("/")[0] for part in parts[1:]]
+                        new_face = ObjFileHandler._add_vertices_and_get_relative_indexes(
+                            vertices, indexes, current_object, global_to_local, vertex_to_local
+                        )
+                        current_object.faces.append(new_face)
+                    case "l":
+                        indexes = [part.split("/")[0] for part in parts[1:]]
+                        new_line = ObjFileHandler._add_vertices_and_get_relative_indexes(
+                            vertices, indexes, current_object, global_to_local, vertex_to_local
+                        )
+                        current_object.lines.append(new_line)
+                    case "p":
+                        new_points = ObjFileHandler._add_vertices_and_get_relative_indexes(
+                            vertices, parts[1:], current_object, global_to_local, vertex_to_local
+                        )
+                        current_object.points += new_points
+
+        if current_object is not None:
+            yield current_object
 
-        for line in content:
-            split_by_comment = line.split("#")
-            before_comment = split_by_comment[0]
-            if not before_comment:
-                continue
+    @staticmethod
+    def iter_read_parallel(
+            filename: str,
+            workers: int = None,
+            chunk_size: int = PARALLEL_IMPORT_CHUNK_SIZE,
+            progress: Callable[[float], None] = None,
+            on_mtllib: Callable[[str], None] = None,
+            cancel_event: threading.Event = None,
+    ) -> Iterator[ObjectDescriptor]:
+        """
+        Lê o arquivo em paralelo: o texto é dividido em blocos de linhas inteiras, cada bloco é lido por um
+        processo (ver _parse_chunk) e os resultados voltam como arrays em memória compartilhada. A junção
+        (tabela global de vértices, índices relativos, materiais e objetos que atravessam blocos) é feita aqui,
+        e os objetos são produzidos na ordem do arquivo, com os vértices em um array (N, 4).
+
+        Arquivos que cabem em um único bloco são lidos por iter_read.
+
+        progress: recebe a fração dos blocos já lidos (de 0 a 1)
+        on_mtllib: recebe o caminho de cada arquivo de materiais (.mtl) usado
+        cancel_event: interrompe a leitura quando marcado, inclusive enquanto os blocos são lidos (os blocos
+            ainda não iniciados são cancelados e nenhum objeto é produzido)
+        """
+        try:
+            size = os.path.getsize(filename)
+        except OSError as e:
+            print(f"Erro ao abrir o arquivo: {e}")
+            return
+
+        bounds = ObjFileHandler._split_at_lines(filename, size, chunk_size)
+        if len(bounds) <= 2:
+            yield from ObjFileHandler.iter_read(filename, progress, on_mtllib, cancel_event)
+            return
+
+        n_chunks = len(bounds) - 1
+        # forkserver: a importação roda em uma thread (ver ImportWorker) de um processo com várias threads (GTK),
+        # que não deve ser copiado com fork
+        context = multiprocessing.get_context("forkserver")
+        executor = ProcessPoolExecutor(min(workers or os.cpu_count() or 1, n_chunks), mp_context=context)
+        try:
+            futures = [
+                executor.submit(ObjFileHandler._parse_chunk, filename, start, end)
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            pending = set(futures)
+            while pending and not (cancel_event is not None and cancel_event.is_set()):
+                _, pending = wait(pending, ObjFileHandler._CANCEL_POLL_INTERVAL, FIRST_COMPLETED)
+                if progress is not None:
+                    progress((n_chunks - len(pending)) / n_chunks)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)  # não espera os blocos em andamento (cancelamento)
+
+        cancelled = bool(pending)
+        error = None if cancelled else next((f.exception() for f in futures if f.exception() is not None), None)
+        if cancelled or error is not None:
+            # nada é juntado: a memória de cada bloco é liberada diretamente, a dos em andamento quando terminarem
+            for future in futures:
+                future.add_done_callback(ObjFileHandler._release_chunk)
+            if error is not None:
+                raise error
+            return
+        merged = ObjFileHandler._merge_chunks([future.result() for future in futures])
+        yield from ObjFileHandler._assemble_objects(filename, *merged, on_mtllib)
+
+    @staticmethod
+    def _split_at_lines(filename: str, size: int, chunk_size: int) -> List[int]:
+        """Posições (em bytes) dos limites dos blocos, ajustadas para o início da linha seguinte"""
+        bounds = [0]
+        if size == 0:
+            return bounds + [0]
+        with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = chunk_size
+            while position < size:
+                line_end = data.find(b"\n", position)
+                if line_end < 0:
+                    break
+                bounds.append(line_end + 1)
+                position = line_end + 1 + chunk_size
+        if bounds[-1] < size:
+            bounds.append(size)
+        return bounds
+
+    @staticmethod
+    def _parse_chunk(filename: str, start: int, end: int) -> Tuple[str, list, list]:
+        """
+        Lê as linhas de um bloco do arquivo (executado em um processo separado).
+
+        Os índices de vértices são convertidos para base 0: os positivos já são globais e os negativos passam a
+        ser relativos ao início do bloco (marcados em `relative`), pois a quantidade de vértices dos blocos
+        anteriores só é conhecida na junção. As diretivas o, usemtl e mtllib são devolvidas como eventos
+        (posição do elemento, diretiva, argumentos).
+
+        Returns:
+            nome e layout da memória compartilhada com os arrays do bloco (ver _to_shared_memory), e os eventos
+        """
+        with open(filename, "rb") as file:
+            file.seek(start)
+            text = file.read(end - start).decode("utf-8")
+
+        vertex_values = []
+        kinds = []
+        lengths = []
+        vertex_counts = []  # vértices do bloco lidos até cada elemento
+        index_values = []
+        events = []
+        for line in text.split("\n"):
+            before_comment = line.split("#")[0] if "#" in line else line
             parts = before_comment.split()
             if not parts:
                 continue
             prefix = parts[0]
 
+            match prefix:
+                case "v":
+                    x, y, z = parts[1:4]  # como em iter_read: exatamente 3 coordenadas (w é ignorado)
+                    vertex_values += (x, y, z)
+                    continue
+                case "f" | "l":
+                    if "/" in before_comment:
+                        indexes = [part.split("/")[0] for part in parts[1:]]
+                    else:
+                        indexes = parts[1:]
+                case "p":
+                    indexes = parts[1:]
+                case "o" | "usemtl" | "mtllib":
+                    events.append((len(kinds), prefix, parts[1:]))
+                    continue
+                case _:
+                    continue
+            kinds.append(ObjFileHandler._ELEMENT_KINDS[prefix])
+            lengths.append(len(indexes))
+            vertex_counts.append(len(vertex_values) // 3)
+            index_values.extend(indexes)
+
+        lengths = np.array(lengths, dtype=np.int64)
+        indexes = np.array(index_values, dtype=np.int64)
+        relative = indexes < 0
+        vertex_counts = np.repeat(np.array(vertex_counts, dtype=np.int64), lengths)
+        indexes = np.where(indexes > 0, indexes - 1, indexes + relative * vertex_counts)
+        name, layout = ObjFileHandler._to_shared_memory({
+            "vertices": np.array(vertex_values, dtype=np.float64).reshape(-1, 3),
+            "kinds": np.array(kinds, dtype=np.uint8),
+            "lengths": lengths,
+            "indexes": indexes,
+            "relative": relative,
+        })
+        return name, layout, events
+
+    @staticmethod
+    def _merge_chunks(results: list) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list]:
+        """
+        Junta os blocos em arrays globais (vértices, tipos e tamanhos dos elementos, índices globais) e eventos com
+        posições globais, liberando a memória compartilhada de cada bloco
+        """
+        vertices, kinds, lengths, indexes, events = [], [], [], [], []
+        vertex_offset = 0
+        element_offset = 0
+        for name, layout, chunk_events in results:
+            memory, arrays = ObjFileHandler._from_shared_memory(name, layout)
+            try:
+                vertices.append(arrays["vertices"].copy())
+                kinds.append(arrays["kinds"].copy())
+                lengths.append(arrays["lengths"].copy())
+                indexes.append(arrays["indexes"] + arrays["relative"] * vertex_offset)
+                events += [(position + element_offset, prefix, args) for position, prefix, args in chunk_events]
+                vertex_offset += len(arrays["vertices"])
+                element_offset += len(arrays["kinds"])
+            finally:
+                del arrays
+                memory.close()
+                memory.unlink()
+
+        if not results:
+            return np.empty((0, 3)), np.empty(0, np.uint8), np.empty(0, np.int64), np.empty(0, np.int64), events
+        return (
+            np.concatenate(vertices), np.concatenate(kinds), np.concatenate(lengths), np.concatenate(indexes), events
+        )
+
+    @staticmethod
+    def _release_chunk(future: Future):
+        """Libera a memória compartilhada de um bloco lido que não será juntado (leitura cancelada ou com erro)"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        name, _, _ = future.result()
+        memory = shared_memory.SharedMemory(name=name)
+        memory.close()
+        memory.unlink()
+
+    @staticmethod
+    def _assemble_objects(
+            filename: str,
+            vertices: np.ndarray,
+            kinds: np.ndarray,
+            lengths: np.ndarray,
+            indexes: np.ndarray,
+            events: list,
+            on_mtllib: Callable[[str], None] = None,
+    ) -> Iterator[ObjectDescriptor]:
+        """Aplica os eventos em ordem e produz cada objeto com os elementos entre o seu `o` e o próximo"""
+        obj_directory = os.path.dirname(filename)
+        index_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=index_offsets[1:])
+        materials = {}
+        current_object = None
+        object_start = 0
+
+        for position, prefix, args in events + [(len(kinds), None, None)]:
             match prefix:
                 case "mtllib":
-                    for filename in parts[1:]:
-                        mtl_file_path = os.path.join(obj_directory, filename)
-                        new_materials = ObjFileHandler.process_mtllib(mtl_file_path)
-                        materials.update(new_materials)
-                case "o":
-                    object_name = parts[1]
-                    current_object = ObjectDescriptor(object_name)
-                    object_descriptors.append(current_object)
+                    for mtl_filename in args:
+                        mtl_file_path = os.path.join(obj_directory, mtl_filename)
+                        if on_mtllib is not None:
+                            on_mtllib(mtl_file_path)
+                        materials.update(ObjFileHandler.process_mtllib(mtl_file_path))
                 case "usemtl":
-                    material_name = parts[1]
-                    material = materials[material_name]
-                    if material and material["Kd"]:
+                    material = materials[args[0]]
+                    if current_object is not None and material and material["Kd"]:
                         current_object.color = material["Kd"]
-                case "v":
-                    x, y, z = map(float, parts[1:4])
-                    vertices.append((x, y, z))
-                case "f":
-                    indexes = [part.split("/")[0] for part in parts[1:]]
-                    new_face = ObjFileHandler._add_vertices_and_get_relative_indexes(
-                        vertices, indexes, current_object
-                    )
-                    current_object.faces.append(new_face)
-                case "l":
-                    indexes = [part.split("/")[0] for part in parts[1:]]
-                    new_line = ObjFileHandler._add_vertices_and_get_relative_indexes(
-                        vertices, indexes, current_object
-                    )
-                    current_object.lines.append(new_line)
-                case "p":
-                    new_points = ObjFileHandler._add_vertices_and_get_relative_indexes(
-                        vertices, parts[1:], current_object
-                    )
-                    current_object.points += new_points
+                case _:  # "o" ou o fim do arquivo
+                    if current_object is not None:
+                        ObjFileHandler._fill_object(
+                            current_object, vertices, kinds, index_offsets, indexes, object_start, position
+                        )
+                        yield current_object
+                    if prefix == "o":
+                        current_object = ObjectDescriptor(args[0])
+                        object_start = position
 
-        return object_descriptors
+    @staticmethod
+    def _fill_object(
+            obj: ObjectDescriptor,
+            vertices: np.ndarray,
+            kinds: np.ndarray,
+            index_offsets: np.ndarray,
+            indexes: np.ndarray,
+            first: int,
+            last: int,
+    ):
+        """
+        Adiciona ao objeto os elementos [first, last). Como em iter_read, vértices de mesmo valor viram um único
+        vértice do objeto, numerado na ordem da primeira referência.
+        """
+        start, end = int(index_offsets[first]), int(index_offsets[last])
+        if start == end:
+            return
+        # vértices referenciados (índices globais distintos), na ordem da primeira referência
+        references, first_reference, reference_inverse = np.unique(
+            indexes[start:end], return_index=True, return_inverse=True
+        )
+        by_first_reference = np.argsort(first_reference)
+        references = references[by_first_reference]
+        reference_inverse = np.argsort(by_first_reference)[reference_inverse.reshape(-1)]
+
+        # agrupa os de mesmo valor (-0.0 e 0.0 são o mesmo vértice, como nas tuplas); cada grupo fica com a
+        # primeira referência, então a numeração segue a ordem de iter_read
+        values = vertices[references] + 0.0
+        by_value = np.lexsort(values.T[::-1])
+        sorted_values = values[by_value]
+        new_value = np.ones(len(values), dtype=bool)
+        new_value[1:] = np.any(sorted_values[1:] != sorted_values[:-1], axis=1)
+        value_group = np.empty(len(values), dtype=np.int64)
+        value_group[by_value] = np.cumsum(new_value) - 1
+        _, group_first, group_inverse = np.unique(value_group, return_index=True, return_inverse=True)
+        group_order = np.argsort(group_first)
+        group_rank = np.argsort(group_order)
+        obj.vertices = to_homogeneous_array(values[group_first[group_order]])
+        local_indexes = group_rank[group_inverse.reshape(-1)][reference_inverse]
+
+        element_kinds = kinds[first:last]
+        element_offsets = index_offsets[first:last + 1] - start
+        element_lengths = np.diff(element_offsets)
+        reference_kinds = np.repeat(element_kinds, element_lengths)
+        for kind, elements in ((0, obj.faces), (1, obj.lines)):
+            is_kind = element_kinds == kind
+            if not is_kind.any():
+                continue
+            kind_indexes = local_indexes[reference_kinds == kind]
+            kind_lengths = element_lengths[is_kind]
+            if np.all(kind_lengths == kind_lengths[0]):  # caso comum (só triângulos, por exemplo): sem fatiar
+                elements += kind_indexes.reshape(-1, int(kind_lengths[0])).tolist()
+            else:
+                bounds = np.concatenate(([0], np.cumsum(kind_lengths))).tolist()
+                kind_indexes = kind_indexes.tolist()
+                elements += [kind_indexes[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        obj.points += local_indexes[reference_kinds == 2].tolist()
+
+    @staticmethod
+    def _to_shared_memory(arrays: Dict[str, np.ndarray]) -> Tuple[str, list]:
+        """
+        Copia os arrays para um único bloco de memória compartilhada. O bloco pertence ao processo que faz a junção,
+        que o libera (unlink) depois de copiar os arrays (ver _merge_chunks)
+        """
+        layout = []
+        size = 0
+        for key, array in arrays.items():
+            layout.append((key, array.dtype.str, array.shape, size))
+            size += array.nbytes + (-array.nbytes % 8)
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for (key, dtype, shape, offset), array in zip(layout, arrays.values()):
+            np.ndarray(shape, dtype, memory.buf, offset)[...] = array
+        memory.close()
+        return memory.name, layout
+
+    @staticmethod
+    def _from_shared_memory(name: str, layout: list) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+        memory = shared_memory.SharedMemory(name=name)
+        arrays = {key: np.ndarray(shape, dtype, memory.buf, offset) for key, dtype, shape, offset in layout}
+        return memory, arrays
 
     @staticmethod
     def process_mtllib(filename: str) -> dict:
@@ -181,14 +603,347 @@ class ObjFileHandler:
         vertices: List[Tuple[float, float, float]],
         indexes: List[str],
         obj: ObjectDescriptor,
+        global_to_local: Dict[int, int],
+        vertex_to_local: Dict[Tuple[float, float, float], int],
     ):
+        """
+        Converte índices do arquivo em índices do objeto, adicionando ao objeto os vértices ainda não usados.
+        Vértices repetidos (mesmo valor) são adicionados uma única vez; os dois mapas do objeto tornam cada
+        referência O(1).
+        """
         relative_indexes = []
         for i in indexes:
             index = int(i)
             if index > 0:
                 index -= 1
-            vertice = vertices[index]
-            if vertice not in obj.vertices:
-                obj.vertices.append(vertice)
-            relative_indexes.append(obj.vertices.index(vertice))
+            elif index < 0:  # relativo ao fim da lista de vértices lidos até aqui
+                index += len(vertices)
+            local_index = global_to_local.get(index)
+            if local_index is None:
+                vertice = vertices[index]
+                local_index = vertex_to_local.get(vertice)
+                if local_index is None:
+                    local_index = len(obj.vertices)
+                    vertex_to_local[vertice] = local_index
+                    obj.vertices.append(vertice)
+                global_to_local[index] = local_index
+            relative_indexes.append(local_index)
         return relative_indexes
+
+
+class SceneFileHandler:
+    """
+    Formato binário de cena do SGI (.sgi), carregado com mmap: os vértices de cada objeto são entregues como
+    views do arquivo, sem cópia nem conversão de texto.
+
+    Layout (little-endian, blocos alinhados em 8 bytes):
+        cabeçalho: magic "SGIS", versão (u16), reservado (u16), quantidade de objetos (u32), quantidade de arquivos
+                   de materiais (u32), mtime (ns, i64) e tamanho (i64) do .obj de origem (0 se a cena não veio de
+                   um .obj) e posição (u64) do bloco de arquivos de materiais
+        para cada objeto:
+            cabeçalho: tamanho do nome, vértices, pontos, linhas, faces e índices de linhas e de faces (u32 cada),
+                       reservado (u32), cor RGB (3 x f64), caixa envolvente dos vértices (6 x f64: mínimos e
+                       máximos de x, y, z), que permite indexar o objeto sem ler os vértices
+            nome (utf-8)
+            vértices: (vértices, 4) f64, em coordenadas homogêneas
+            pontos: (pontos,) i32
+            linhas: offsets (linhas + 1,) i64 e índices concatenados i32; faces no mesmo formato
+            os índices de pontos, linhas e faces são locais ao objeto e em base 0 (os índices negativos dos
+            descritores exportados, relativos ao fim dos vértices do objeto, são convertidos na gravação)
+        arquivos de materiais (.mtl) usados pelo .obj de origem, para validar o cache:
+            mtime (ns, i64) e tamanho (i64), -1 se o arquivo não existia, tamanho do caminho (u32), reservado (u32)
+            caminho absoluto (utf-8)
+    """
+
+    MAGIC = b"SGIS"
+    VERSION = 4
+    EXTENSION = ".sgi"
+    CACHE_SUFFIX = ".sgicache"  # cache binário gravado ao lado de um .obj importado
+
+    _HEADER = struct.Struct("<4sHHIIqqQ")
+    _OBJECT_HEADER = struct.Struct("<8I9d")
+    _FILE_STAT = struct.Struct("<qqI4x")
+
+    @staticmethod
+    def save(filename: str, object_list: Iterable[ObjectDescriptor]):
+        with SceneWriter(filename) as writer:
+            for obj in object_list:
+                writer.write(obj)
+            writer.commit()
+
+    @staticmethod
+    def read(filename: str) -> List[ObjectDescriptor]:
+        return list(SceneFileHandler.iter_read(filename))
+
+    @staticmethod
+    def iter_read(filename: str, progress: Callable[[float], None] = None) -> Iterator[ObjectDescriptor]:
+        """
+        Produz os objetos do arquivo; os vértices de cada descritor são um array (N, 4) somente leitura do mmap.
+
+        progress: recebe a fração do arquivo já lida (de 0 a 1), a cada objeto
+        """
+        try:
+            buffer = SceneFileHandler._map(filename)
+        except Exception as e:
+            print(f"Erro ao abrir o arquivo: {e}")
+            return
+
+        magic, version, _, n_objects, _, _, _, _ = SceneFileHandler._HEADER.unpack_from(buffer, 0)
+        if magic != SceneFileHandler.MAGIC or version != SceneFileHandler.VERSION:
+            print(f"Arquivo de cena inválido ou de versão não suportada: {filename}")
+            return
+
+        offset = SceneFileHandler._HEADER.size
+        for _ in range(n_objects):
+            obj, offset = SceneFileHandler._read_object(buffer, offset)
+            if progress is not None:
+                progress(offset / len(buffer))
+            yield obj
+
+    @staticmethod
+    def get_cache_filename(obj_filename: str) -> str:
+        return obj_filename + SceneFileHandler.CACHE_SUFFIX
+
+    @staticmethod
+    def iter_read_obj_cached(
+            obj_filename: str,
+            parallel: bool = False,
+            progress: Callable[[float], None] = None,
+            cancel_event: threading.Event = None,
+    ) -> Iterator[ObjectDescriptor]:
+        """
+        Lê um .obj usando o cache binário ao lado dele, se nem o .obj nem os seus .mtl mudaram desde que o cache
+        foi gravado (mesmo mtime e tamanho). Senão lê o texto (em paralelo, se `parallel`) e grava um novo cache
+        à medida que os objetos são lidos (ver SceneWriter), sem mantê-los em memória. Uma leitura cancelada
+        (cancel_event) não grava o cache.
+        """
+        cache_filename = SceneFileHandler.get_cache_filename(obj_filename)
+        try:
+            source_stat = os.stat(obj_filename)
+        except OSError:
+            source_stat = None
+
+        if source_stat is not None and SceneFileHandler.is_cache_valid(cache_filename, source_stat):
+            yield from SceneFileHandler.iter_read(cache_filename, progress)
+            return
+
+        material_files = []
+        if parallel:
+            objects = ObjFileHandler.iter_read_parallel(
+                obj_filename, progress=progress, on_mtllib=material_files.append, cancel_event=cancel_event
+            )
+        else:
+            objects = ObjFileHandler.iter_read(obj_filename, progress, material_files.append, cancel_event)
+        if source_stat is None:
+            yield from objects
+            return
+
+        try:
+            writer = SceneWriter(cache_filename, source_stat)
+        except OSError as e:
+            print(f"Não foi possível gravar o cache da cena: {e}")
+            writer = None
+        try:
+            for obj in objects:
+                if writer is not None:
+                    try:
+                        writer.write(obj)
+                    except OSError as e:
+                        print(f"Não foi possível gravar o cache da cena: {e}")
+                        writer.abort()
+                        writer = None
+                yield obj
+            if writer is not None and not (cancel_event is not None and cancel_event.is_set()):
+                try:
+                    writer.commit(material_files)
+                except OSError as e:
+                    print(f"Não foi possível gravar o cache da cena: {e}")
+        finally:
+            if writer is not None:
+                writer.abort()  # leitura interrompida ou com erro: o cache incompleto é descartado
+
+    @staticmethod
+    def is_cache_valid(cache_filename: str, source_stat: os.stat_result) -> bool:
+        try:
+            with open(cache_filename, "rb") as file:
+                header = file.read(SceneFileHandler._HEADER.size)
+                if len(header) < SceneFileHandler._HEADER.size:
+                    return False
+                (
+                    magic, version, _, _, n_materials, source_mtime, source_size, materials_offset
+                ) = SceneFileHandler._HEADER.unpack(header)
+                if not (
+                    magic == SceneFileHandler.MAGIC
+                    and version == SceneFileHandler.VERSION
+                    and source_mtime == source_stat.st_mtime_ns
+                    and source_size == source_stat.st_size
+                ):
+                    return False
+                file.seek(materials_offset)
+                for _ in range(n_materials):
+                    entry = file.read(SceneFileHandler._FILE_STAT.size)
+                    if len(entry) < SceneFileHandler._FILE_STAT.size:
+                        return False
+                    mtime, size, path_length = SceneFileHandler._FILE_STAT.unpack(entry)
+                    path = file.read(path_length + (-path_length % 8))[:path_length].decode("utf-8")
+                    if SceneFileHandler._get_file_stat(path) != (mtime, size):
+                        return False
+        except (OSError, UnicodeDecodeError):
+            return False
+        return True
+
+    @staticmethod
+    def _get_file_stat(path: str) -> Tuple[int, int]:
+        """(mtime em ns, tamanho) do arquivo, ou (-1, -1) se ele não existir"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return -1, -1
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _write_file_stat(file, path: str):
+        path = os.path.abspath(path)
+        encoded_path = path.encode("utf-8")
+        file.write(SceneFileHandler._FILE_STAT.pack(*SceneFileHandler._get_file_stat(path), len(encoded_path)))
+        file.write(encoded_path + bytes(-len(encoded_path) % 8))
+
+    @staticmethod
+    def _map(filename: str) -> memoryview:
+        with open(filename, "rb") as file:
+            # o mapeamento continua válido depois de fechar o arquivo; os arrays mantêm o mmap vivo
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def _write_object(file, obj: ObjectDescriptor):
+        name = obj.name.encode("utf-8")
+        vertices = to_homogeneous_array(obj.vertices).astype("<f8", copy=False)
+        points = SceneFileHandler._to_local_indexes(np.asarray(obj.points, dtype="<i4").reshape(-1), len(vertices))
+        line_offsets, line_indexes = SceneFileHandler._flatten(obj.lines)
+        face_offsets, face_indexes = SceneFileHandler._flatten(obj.faces)
+        line_indexes = SceneFileHandler._to_local_indexes(line_indexes, len(vertices))
+        face_indexes = SceneFileHandler._to_local_indexes(face_indexes, len(vertices))
+
+        r, g, b = [float(i) for i in obj.color]
+        if len(vertices):
+            bounds = np.concatenate((vertices[:, :3].min(axis=0), vertices[:, :3].max(axis=0)))
+        else:
+            bounds = np.array([np.inf, np.inf, np.inf, -np.inf, -np.inf, -np.inf])
+        file.write(SceneFileHandler._OBJECT_HEADER.pack(
+            len(name), len(vertices), len(points), len(obj.lines), len(obj.faces),
+            len(line_indexes), len(face_indexes), 0, r, g, b, *bounds.tolist(),
+        ))
+        for block in (name, vertices, points, line_offsets, line_indexes, face_offsets, face_indexes):
+            data = block if isinstance(block, bytes) else block.tobytes()
+            file.write(data)
+            file.write(bytes(-len(data) % 8))
+
+    @staticmethod
+    def _read_object(buffer: memoryview, offset: int) -> Tuple[ObjectDescriptor, int]:
+        (
+            name_length, n_vertices, n_points, n_lines, n_faces, n_line_indexes, n_face_indexes, _, r, g, b, *bounds
+        ) = SceneFileHandler._OBJECT_HEADER.unpack_from(buffer, offset)
+        offset += SceneFileHandler._OBJECT_HEADER.size
+
+        def take(dtype: str, count: int) -> np.ndarray:
+            nonlocal offset
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes + (-array.nbytes % 8)
+            return array
+
+        name = bytes(take("u1", name_length)).decode("utf-8")
+        obj = ObjectDescriptor(name)
+        obj.color = (r, g, b)
+        obj.bounds = np.array(bounds)
+        obj.vertices = take("<f8", 4 * n_vertices).reshape(n_vertices, 4)
+        # índices mantidos como views do arquivo: as listas são criadas quando o objeto é carregado
+        # (ver WireframeObject.load_elements)
+        obj.points = take("<i4", n_points)
+        line_offsets = take("<i8", n_lines + 1)
+        obj.lines = PackedPolylines(line_offsets, take("<i4", n_line_indexes))
+        face_offsets = take("<i8", n_faces + 1)
+        obj.faces = PackedPolylines(face_offsets, take("<i4", n_face_indexes))
+        return obj, offset
+
+    @staticmethod
+    def _flatten(polylines: List[List[int]] | PackedPolylines) -> Tuple[np.ndarray, np.ndarray]:
+        """Listas de índices -> (offsets (L + 1,), índices concatenados)"""
+        if isinstance(polylines, PackedPolylines):
+            return polylines.offsets.astype("<i8", copy=False), polylines.indexes.astype("<i4", copy=False)
+        lengths = [len(polyline) for polyline in polylines]
+        offsets = np.zeros(len(polylines) + 1, dtype="<i8")
+        np.cumsum(lengths, out=offsets[1:])
+        indexes = np.fromiter(
+            (i for polyline in polylines for i in polyline), dtype="<i4", count=int(offsets[-1])
+        )
+        return offsets, indexes
+
+    @staticmethod
+    def _to_local_indexes(indexes: np.ndarray, n_vertices: int) -> np.ndarray:
+        """Índices negativos (relativos ao fim dos vértices do objeto, como na exportação .obj) -> base 0"""
+        return np.where(indexes < 0, indexes + n_vertices, indexes).astype("<i4", copy=False)
+
+
+class SceneWriter:
+    """
+    Grava uma cena binária (.sgi) objeto a objeto, sem manter os objetos em memória. Os objetos vão para um arquivo
+    temporário ao lado do destino; commit completa o cabeçalho (quantidade de objetos e arquivos de materiais) e
+    renomeia o arquivo para o destino, e abort o descarta. Como gerenciador de contexto, descarta o arquivo se o
+    bloco terminar sem commit.
+    """
+
+    _filename: str
+    _temporary_filename: str
+    _file: IO
+    _source_stat: os.stat_result | None
+    _n_objects: int
+    _closed: bool
+
+    def __init__(self, filename: str, source_stat: os.stat_result = None):
+        """source_stat: stat do .obj de origem, quando o arquivo é o cache de um .obj"""
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._filename = filename
+        self._temporary_filename = f"{filename}.{os.getpid()}.tmp"
+        self._source_stat = source_stat
+        self._n_objects = 0
+        self._file = open(self._temporary_filename, "wb", buffering=WRITE_BUFFER_SIZE)
+        self._closed = False
+        self._file.write(bytes(SceneFileHandler._HEADER.size))  # preenchido em commit
+
+    def __enter__(self) -> "SceneWriter":
+        return self
+
+    def __exit__(self, *_):
+        self.abort()
+
+    def write(self, obj: ObjectDescriptor):
+        SceneFileHandler._write_object(self._file, obj)
+        self._n_objects += 1
+
+    def commit(self, material_files: List[str] = ()):
+        """material_files: arquivos .mtl usados pelo .obj de origem; o cache deixa de valer se algum deles mudar"""
+        materials_offset = self._file.tell()
+        for path in material_files:
+            SceneFileHandler._write_file_stat(self._file, path)
+
+        source = self._source_stat
+        source_mtime, source_size = (source.st_mtime_ns, source.st_size) if source else (0, 0)
+        self._file.seek(0)
+        self._file.write(SceneFileHandler._HEADER.pack(
+            SceneFileHandler.MAGIC, SceneFileHandler.VERSION, 0, self._n_objects, len(material_files),
+            source_mtime, source_size, materials_offset,
+        ))
+        self._file.close()
+        os.replace(self._temporary_filename, self._filename)
+        self._closed = True
+
+    def abort(self):
+        """Descarta o arquivo temporário (nada a fazer depois de commit)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._file.close()
+        if os.path.exists(self._temporary_filename):
+            os.remove(self._temporary_filename)
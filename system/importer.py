@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Callable, Iterator, List, Tuple
+
+import numpy as np
+
+from system.files import ObjectDescriptor
+from system.objects import GraphicObject
+
+IMPORT_BATCH_SIZE = 256  # objetos por lote entregue à thread principal
+IMPORT_UPDATE_INTERVAL = 0.05  # segundos entre lotes, mesmo que incompletos
+MAX_PENDING_BATCHES = 4  # lotes aguardando a thread principal antes de a leitura esperar
+PROGRESS_UPDATE_INTERVAL = 0.1  # segundos entre atualizações do progresso sem objetos (ver _set_progress)
+PROGRESS_UPDATE_STEP = 0.01  # avanço mínimo da fração lida entre essas atualizações
+
+ImportedObject = Tuple[GraphicObject, np.ndarray | None]  # objeto e caixa envolvente lida do arquivo (ou None)
+
+
+class ImportWorker:
+    """
+    Importa um arquivo em uma thread separada: a leitura e a criação dos objetos ficam na thread, e os objetos
+    criados são entregues em lotes à thread principal, que é a única a alterar a cena e a interface.
+
+    A entrega é feita por `schedule` (GLib.idle_add na interface), que executa uma função na thread principal.
+    No máximo MAX_PENDING_BATCHES lotes ficam pendentes: se a thread principal não acompanha, a leitura espera.
+    O progresso também é entregue enquanto nenhum objeto é produzido (blocos da leitura paralela, objetos grandes),
+    em lotes vazios limitados por PROGRESS_UPDATE_INTERVAL e PROGRESS_UPDATE_STEP.
+    """
+
+    _filename: str
+    _read: Callable[[str, Callable[[float], None], threading.Event], Iterator[ObjectDescriptor]]
+    _schedule: Callable[..., int]
+    _on_batch: Callable[[List[ImportedObject], float], None]
+    _on_finish: Callable[[bool, Exception | None], None]
+    _thread: threading.Thread
+    _cancelled: threading.Event
+    _pending_batches: threading.Semaphore
+    _fraction: float  # fração do arquivo já lida, atualizada pelo leitor
+    _reported_fraction: float  # última fração entregue à thread principal
+    _last_progress_update: float  # time.monotonic() da última entrega do progresso
+    _progress_pending: bool  # atualização do progresso agendada e ainda não executada
+
+    def __init__(
+            self,
+            filename: str,
+            read: Callable[[str, Callable[[float], None], threading.Event], Iterator[ObjectDescriptor]],
+            schedule: Callable[..., int],
+            on_batch: Callable[[List[ImportedObject], float], None],
+            on_finish: Callable[[bool, Exception | None], None],
+    ) -> None:
+        """
+        Args:
+            read: leitor do arquivo, que recebe o nome do arquivo, uma função de progresso e o evento de
+                cancelamento, para interromper também fases em que nenhum objeto é produzido (leitura paralela)
+            on_batch: chamada na thread principal com cada lote e a fração do arquivo já lida (lotes vazios só
+                atualizam o progresso)
+            on_finish: chamada na thread principal ao final, com (cancelada, erro)
+        """
+        self._filename = filename
+        self._read = read
+        self._schedule = schedule
+        self._on_batch = on_batch
+        self._on_finish = on_finish
+        self._thread = threading.Thread(target=self._run, name="import", daemon=True)
+        self._cancelled = threading.Event()
+        self._pending_batches = threading.Semaphore(MAX_PENDING_BATCHES)
+        self._fraction = 0.0
+        self._reported_fraction = 0.0
+        self._last_progress_update = time.monotonic()
+        self._progress_pending = False
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        """Interrompe a leitura no próximo objeto ou chunk; lotes ainda não entregues são descartados"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _set_progress(self, fraction: float):
+        """
+        Chamada pelo leitor; agenda a atualização do progresso na thread principal se a fração avançou ao menos
+        PROGRESS_UPDATE_STEP e a última foi há PROGRESS_UPDATE_INTERVAL, com no máximo uma pendente
+        """
+        self._fraction = fraction
+        now = time.monotonic()
+        if (
+            self._progress_pending
+            or fraction - self._reported_fraction < PROGRESS_UPDATE_STEP
+            or now - self._last_progress_update < PROGRESS_UPDATE_INTERVAL
+        ):
+            return
+        self._progress_pending = True
+        self._reported_fraction = fraction
+        self._last_progress_update = now
+        self._schedule(self._dispatch_progress, fraction)
+
+    def _run(self):
+        error = None
+        batch = []
+        last_delivery = time.monotonic()
+        objects = self._read(self._filename, self._set_progress, self._cancelled)
+        try:
+            for descriptor in objects:
+                if self.cancelled:
+                    break
+                graphic_obj = GraphicObject.get_2d_object(descriptor)
+                if graphic_obj:
+                    batch.append((graphic_obj, descriptor.bounds))
+                if len(batch) >= IMPORT_BATCH_SIZE or time.monotonic() - last_delivery > IMPORT_UPDATE_INTERVAL:
+                    if not self._deliver(batch):
+                        break
+                    batch = []
+                    last_delivery = time.monotonic()
+            else:
+                self._fraction = 1.0
+                self._deliver(batch)
+        except Exception as e:
+            error = e
+        finally:
+            objects.close()
+        self._schedule(self._finish, error)
+
+    def _deliver(self, batch: List[ImportedObject]) -> bool:
+        """Agenda a entrega do lote na thread principal; False se a importação foi cancelada enquanto esperava"""
+        while not self._pending_batches.acquire(timeout=IMPORT_UPDATE_INTERVAL):
+            if self.cancelled:
+                return False
+        self._schedule(self._dispatch, batch, self._fraction)
+        return True
+
+    def _dispatch(self, batch: List[ImportedObject], fraction: float) -> bool:
+        self._pending_batches.release()
+        if not self.cancelled:
+            self._on_batch(batch, fraction)
+        return False  # executa uma única vez (ver GLib.idle_add)
+
+    def _dispatch_progress(self, fraction: float) -> bool:
+        self._progress_pending = False
+        if not self.cancelled:
+            self._on_batch([], fraction)
+        return False
+
+    def _finish(self, error: Exception | None) -> bool:
+        self._on_finish(self.cancelled, error)
+        return False
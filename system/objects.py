@@ -1,41 +1,55 @@
 import math
+import threading
 from abc import ABC, abstractmethod
-from typing import Callable, List
+from functools import lru_cache
+from typing import Callable, Dict, List
 
 import cairo
 import numpy as np
 
 from globals import ObjectType
-from system.basics import Point
+from system.basics import Point, to_homogeneous_array
 from system.clipping import Clipping
-from system.files import ObjectDescriptor
+from system.files import ObjectDescriptor, PackedPolylines
+from validation import Validation
 
 
 class GraphicObject(ABC):
     _id_increment = 0
+    _id_lock = threading.Lock()  # objetos também são criados pela thread de importação (ver ImportWorker)
 
     _id = int
     _name: str
-    _points: list[Point]  # lista de pontos (conjuntos de coordenadas x e y)
-    _center: Point
+    _points: np.ndarray  # array (N, 4) de coordenadas homogêneas do mundo
+    _center: Point | None  # calculado sob demanda (ver center)
     _type: ObjectType
     _color: tuple
-    _normalized_points: list[Point]
+    _normalized_points: np.ndarray  # array (N, 4) de coordenadas normalizadas
+    _ignore_mask: np.ndarray  # máscara (N,) dos pontos normalizados que não devem ser desenhados
+    _normalized_bbox: np.ndarray  # (min_x, min_y, max_x, max_y) dos pontos normalizados
     _normalized_center: Point
+    _normalized_generation: int  # geração da janela (ver DisplayFile) dos pontos normalizados atuais
     _rotation_matrix: np.array
 
-    def __init__(self, name: str, points: list, color) -> None:
-        self._id = GraphicObject._id_increment
-        GraphicObject._id_increment += 1
+    def __init__(self, name: str, points, color) -> None:
+        with GraphicObject._id_lock:
+            self._id = GraphicObject._id_increment
+            GraphicObject._id_increment += 1
         self._name = name
-        self._points = points
+        self._points = to_homogeneous_array(points)
         self._color = color
-        self._normalized_points = points
-        self._normalized_center = self.compute_center()
+        # os buffers normalizados são alocados na primeira normalização (ver allocate_normalized_buffers): os
+        # pontos podem ser uma view de um arquivo mapeado em memória, que não deve ser lido na criação
+        self._normalized_points = np.empty((0, 4))
+        self._ignore_mask = np.zeros(0, dtype=bool)
+        self._normalized_bbox = np.empty(4)
+        self.compute_normalized_bbox()
+        self._normalized_generation = -1
+        self._center = None
         self._rotation_matrix = np.identity(4)
 
     def __str__(self):
-        points_str = "".join([("\n\t\t" + str(p)) for p in self._points])
+        points_str = "".join([("\n\t\t" + str(p)) for p in self.get_points_list()])
         return (
             f"GraphicObject: "
             f"\n\t id: {self._id}"
@@ -49,11 +63,17 @@ class GraphicObject(ABC):
         return self._id
 
     @property
-    def points(self) -> list[Point]:
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def points(self) -> np.ndarray:
         return self._points
 
     @property
     def center(self) -> Point:
+        if self._center is None:
+            self.compute_center()
         return self._center
 
     @property
@@ -61,12 +81,43 @@ class GraphicObject(ABC):
         return self._type
 
     @property
-    def normalized_points(self) -> list[Point]:
+    def color(self) -> tuple:
+        return self._color
+
+    @property
+    def normalized_points(self) -> np.ndarray:
         return self._normalized_points
 
+    @property
+    def ignore_mask(self) -> np.ndarray:
+        return self._ignore_mask
+
+    @property
+    def normalized_bbox(self) -> np.ndarray:
+        return self._normalized_bbox
+
+    @property
+    def normalized_generation(self) -> int:
+        return self._normalized_generation
+
+    def mark_normalized(self, generation: int):
+        self._normalized_generation = generation
+
     @property
     def normalized_center(self) -> Point:
-        return self._normalized_center
+        return self.compute_normalized_center()
+
+    def get_point(self, index: int) -> Point:
+        return Point.from_array(self._points[index])
+
+    def get_normalized_point(self, index: int) -> Point:
+        return Point.from_array(self._normalized_points[index], self._ignore_mask[index])
+
+    def get_points_list(self) -> list[Point]:
+        return Point.array_to_list(self._points)
+
+    def get_normalized_points_list(self) -> list[Point]:
+        return Point.array_to_list(self._normalized_points, self._ignore_mask)
 
     @abstractmethod
     def draw(
@@ -75,43 +126,206 @@ class GraphicObject(ABC):
             viewport_transform: "function",
             window_min: Point,
             window_max: Point,
-            clipping: Clipping,
+            clipping: Clipping | None,
     ):
+        """
+        Adiciona as linhas do objeto ao caminho atual do contexto. Cor, espessura e o stroke() ficam a cargo de
+        quem desenha (ver DisplayFile.on_draw), que agrupa os objetos de mesma cor em um único stroke.
+
+        viewport_transform: leva um array (K, 2) de coordenadas normalizadas para coordenadas do dispositivo
+        clipping: None quando o objeto está inteiramente dentro da janela (o recorte é pulado)
+        """
         raise NotImplementedError
 
+    def fill(
+            self,
+            context,
+            viewport_transform: "function",
+            window_min: Point,
+            window_max: Point,
+            clipping: Clipping | None,
+    ):
+        """Adiciona as faces preenchidas do objeto ao caminho atual (o fill() também fica a cargo de quem desenha)"""
+
     def draw_line(self, context: cairo.Context, point1: Point, point2: Point):
-        context.set_source_rgb(*self._color)
-        context.set_line_width(2)
         context.move_to(point1.x, point1.y)
         context.line_to(point2.x, point2.y)
-        context.stroke()
+
+    @staticmethod
+    def add_segments_to_path(context: cairo.Context, segments: np.ndarray):
+        """Adiciona segmentos (K, 2, 2) ao caminho atual; segmentos encadeados viram uma única polilinha"""
+        if len(segments) == 0:
+            return
+        chained = np.zeros(len(segments), dtype=bool)
+        chained[1:] = np.all(segments[1:, 0] == segments[:-1, 1], axis=1)
+        for ((x0, y0), (x1, y1)), is_chained in zip(segments.tolist(), chained.tolist()):
+            if not is_chained:
+                context.move_to(x0, y0)
+            context.line_to(x1, y1)
+
+    def draw_edges(
+            self,
+            context: cairo.Context,
+            edges: np.ndarray,
+            viewport_transform: Callable[[np.ndarray], np.ndarray],
+            window_min: Point,
+            window_max: Point,
+            clipping: Clipping | None,
+    ):
+        """Recorta de uma vez todos os segmentos (array (E, 2) de índices dos extremos) e desenha os aceitos"""
+        if len(edges) == 0:
+            return
+        visible = ~(self._ignore_mask[edges[:, 0]] & self._ignore_mask[edges[:, 1]])
+        segments = self._normalized_points[edges[visible]][:, :, :2]
+
+        if clipping is None:
+            clipped, accept = segments, np.ones(len(segments), dtype=bool)
+        else:
+            clipped, accept = clipping.clip_lines(window_max, window_min, segments)
+        device_segments = viewport_transform(clipped[accept].reshape(-1, 2)).reshape(-1, 2, 2)
+        self.add_segments_to_path(context, device_segments)
+
+    @staticmethod
+    def polylines_to_edges(polylines: List[List[int]] | np.ndarray | PackedPolylines) -> np.ndarray:
+        """
+        Converte polilinhas (listas de índices, array (L, K) de polilinhas de mesmo tamanho ou PackedPolylines) em
+        segmentos (E, 2)
+        """
+        if isinstance(polylines, np.ndarray):
+            return np.stack((polylines[:, :-1], polylines[:, 1:]), axis=2).reshape(-1, 2).astype(np.intp)
+        if isinstance(polylines, PackedPolylines):
+            # pares de índices consecutivos, exceto os que ligam o fim de uma polilinha ao início da próxima
+            indexes = polylines.indexes
+            if len(indexes) < 2:
+                return np.empty((0, 2), dtype=np.intp)
+            same_polyline = np.ones(len(indexes) - 1, dtype=bool)
+            ends = polylines.offsets[1:] - 1
+            same_polyline[ends[(ends >= 0) & (ends < len(same_polyline))]] = False
+            return np.column_stack((indexes[:-1], indexes[1:]))[same_polyline].astype(np.intp)
+        edges = [
+            np.column_stack((line[:-1], line[1:])) for line in polylines if len(line) > 1
+        ]
+        if not edges:
+            return np.empty((0, 2), dtype=np.intp)
+        return np.concatenate(edges).astype(np.intp)
 
     def compute_center(self) -> Point:
-        self._center = Point.get_geometric_center(self._points)
+        self._center = Point.from_array(self._points[:, :3].mean(axis=0))
         return self._center
 
+    def get_world_bbox(self) -> np.ndarray:
+        """(min_x, min_y, min_z, max_x, max_y, max_z) dos pontos do mundo"""
+        if len(self._points) == 0:
+            return np.array([np.inf, np.inf, np.inf, -np.inf, -np.inf, -np.inf])
+        xyz = self._points[:, :3]
+        return np.concatenate((xyz.min(axis=0), xyz.max(axis=0)))
+
+    def compute_normalized_bbox(self) -> np.ndarray:
+        """
+        Caixa envolvente dos pontos normalizados, escrita no próprio array (que pode ser uma linha do SceneBuffer).
+        Os pontos ignorados ficam em (0, 0) e entram na caixa, pois ainda podem ser extremos de segmentos.
+        """
+        if len(self._normalized_points) == 0:
+            self._normalized_bbox[:] = (np.inf, np.inf, -np.inf, -np.inf)
+        else:
+            xy = self._normalized_points[:, :2]
+            xy.min(axis=0, out=self._normalized_bbox[:2])
+            xy.max(axis=0, out=self._normalized_bbox[2:])
+        return self._normalized_bbox
+
     def compute_normalized_center(self) -> Point:
-        self._normalized_center = Point.get_geometric_center(self._points)
+        self._normalized_center = Point.from_array(self._normalized_points[:, :3].mean(axis=0))
         return self._normalized_center
 
-    def update_points(self, new_points: list[Point]):
-        self._points = new_points
-        self.compute_center()
+    def update_points(self, new_points):
+        """
+        new_points: array (N, 3) ou (N, 4), ou lista de Point.
+        Se o tamanho não mudar, os pontos são escritos no próprio array do objeto (que pode ser uma fatia do
+        SceneBuffer da cena).
+        """
+        new_points = to_homogeneous_array(new_points)
+        if new_points.shape == self._points.shape:
+            np.copyto(self._points, new_points)
+        else:
+            self._points = new_points
+            if self.has_normalized_buffers():
+                self.allocate_normalized_buffers()
+        self._center = None
+
+    def bind_buffers(
+            self,
+            points: np.ndarray,
+            normalized_points: np.ndarray,
+            ignore_mask: np.ndarray,
+            normalized_bbox: np.ndarray,
+    ):
+        """Faz o objeto usar fatias externas (ver SceneBuffer) como armazenamento dos seus pontos"""
+        self._points = points
+        self._normalized_points = normalized_points
+        self._ignore_mask = ignore_mask
+        self._normalized_bbox = normalized_bbox
+        self._center = None
+
+    def has_normalized_buffers(self) -> bool:
+        return len(self._normalized_points) == len(self._points) and len(self._points) > 0
+
+    def allocate_normalized_buffers(self):
+        """
+        Aloca buffers normalizados próprios, com o tamanho dos pontos do mundo (o conteúdo é normalizado depois)
+        """
+        self._normalized_points = np.zeros((len(self._points), 4))
+        self._ignore_mask = np.zeros(len(self._points), dtype=bool)
+        self._normalized_generation = -1
+
+    def release_normalized_buffers(self):
+        """Libera os buffers normalizados próprios (ver DisplayFile: orçamento de memória da cena)"""
+        self._normalized_points = np.empty((0, 4))
+        self._ignore_mask = np.zeros(0, dtype=bool)
+        self.compute_normalized_bbox()
+        self._normalized_generation = -1
 
-    def update_normalized_points(self, new_points: list[Point]):
-        self._normalized_points = new_points
-        self.compute_normalized_center()
+    @property
+    def normalized_nbytes(self) -> int:
+        return self._normalized_points.nbytes + self._ignore_mask.nbytes
+
+    def update_normalized_points(self, new_points, ignore_mask: np.ndarray = None):
+        """
+        Args:
+            new_points: array (N, 3) ou (N, 4), ou lista de Point. Pode ser o próprio buffer normalizado
+                do objeto, já preenchido (ver DisplayFile.normalize_object)
+            ignore_mask: máscara (N,) de pontos a ignorar. Se omitida, é lida de `Point.ignore` (lista)
+                ou assume que nenhum ponto é ignorado (array)
+        """
+        if ignore_mask is None:
+            if isinstance(new_points, np.ndarray):
+                ignore_mask = np.zeros(len(new_points), dtype=bool)
+            else:
+                ignore_mask = np.array([p.ignore for p in new_points], dtype=bool)
+        if new_points is not self._normalized_points:
+            new_points = to_homogeneous_array(new_points)
+            if new_points.shape == self._normalized_points.shape:
+                np.copyto(self._normalized_points, new_points)
+            else:
+                self._normalized_points = new_points
+        self._ignore_mask = ignore_mask
+        self.compute_normalized_bbox()
+
+    def load_elements(self):
+        """Cria os índices dos elementos mantidos no formato compacto (ver WireframeObject); nada a fazer aqui"""
+
+    def release_elements(self):
+        """Libera o que load_elements criou"""
 
     def get_descriptor(self) -> ObjectDescriptor:
         descriptor = ObjectDescriptor(self._name)
-        descriptor.vertices = [(p.x, p.y, p.z) for p in self._points]
+        descriptor.vertices = self._points.copy()  # (N, 4): formatado de uma vez na exportação
         descriptor.color = self._color
         descriptor.id = self.id
         return descriptor
 
     @staticmethod
     def get_2d_object(descriptor: ObjectDescriptor):
-        points = ObjectDescriptor.vertices_to_points(descriptor.vertices)
+        points = to_homogeneous_array(descriptor.vertices)
         match len(points):
             case 0:
                 return None
@@ -142,15 +356,14 @@ class PointObject(GraphicObject):
             viewport_transform: "function",
             window_min: Point,
             window_max: Point,
-            clipping: Clipping,
+            clipping: Clipping | None,
     ):
-        point = self._normalized_points[0]
+        point = self.get_normalized_point(0)
         if point.ignore:
             return
-        if clipping.clip_point(window_max, window_min, point):
-            new_point = viewport_transform(point)
-            second_point = Point(new_point.x + 1, new_point.y + 1)
-            super().draw_line(context, new_point, second_point)
+        if clipping is None or clipping.clip_point(window_max, window_min, point):
+            x, y = viewport_transform(self._normalized_points[:1])[0].tolist()
+            super().draw_line(context, Point(x, y), Point(x + 1, y + 1))
 
     def get_descriptor(self) -> ObjectDescriptor:
         descriptor = super().get_descriptor()
@@ -169,24 +382,11 @@ class LineSegmentObject(GraphicObject):
             viewport_transform: "function",
             window_min: Point,
             window_max: Point,
-            clipping: Clipping,
+            clipping: Clipping | None,
     ):
-        point1 = self._normalized_points[0]
-        point2 = self._normalized_points[1]
-
-        if point1.ignore and point2.ignore:
-            return
-
-        new_line = clipping.clip_line(
-            window_max,
-            window_min,
-            point1,
-            point2,
+        self.draw_edges(
+            context, np.array([[0, 1]]), viewport_transform, window_min, window_max, clipping
         )
-        if new_line:
-            initial_point = viewport_transform(new_line[0])
-            end_point = viewport_transform(new_line[1])
-            super().draw_line(context, initial_point, end_point)
 
     def get_descriptor(self) -> ObjectDescriptor:
         descriptor = super().get_descriptor()
@@ -195,9 +395,14 @@ class LineSegmentObject(GraphicObject):
 
 
 class WireframeObject(GraphicObject):
-    _point_indexes: List[int]
-    _lines_indexes: List[List[int]]
-    _faces_indexes: List[List[int]]
+    _point_indexes: List[int] | np.ndarray
+    # linhas e faces lidas de uma cena binária ficam no formato compacto (views do arquivo mapeado em memória);
+    # as listas e os segmentos só existem enquanto o objeto está carregado (ver load_elements)
+    _packed_lines: PackedPolylines | None
+    _packed_faces: PackedPolylines | None
+    _lines_indexes: List[List[int]] | None
+    _faces_indexes: List[List[int]] | None
+    _edges: np.ndarray | None  # segmentos (E, 2) das linhas, para recortar todos de uma vez
 
     def __init__(
             self,
@@ -208,32 +413,74 @@ class WireframeObject(GraphicObject):
             point_indexes=None,
             lines_indexes=None,
             faces_indexes=None,
+            edges: np.ndarray = None,
     ) -> None:
+        """
+        lines_indexes, faces_indexes: listas de índices ou PackedPolylines (criadas só quando necessárias)
+        edges: segmentos (E, 2) das linhas, se já calculados; senão vêm de lines_indexes
+        """
         super().__init__(name, points, color)
         self._type = wtype
         self._point_indexes = point_indexes if point_indexes is not None else []
-        self._lines_indexes = lines_indexes if lines_indexes is not None else []
-        self._faces_indexes = faces_indexes if faces_indexes is not None else []
+        self._packed_lines = lines_indexes if isinstance(lines_indexes, PackedPolylines) else None
+        self._packed_faces = faces_indexes if isinstance(faces_indexes, PackedPolylines) else None
+        if self._packed_lines is not None:
+            self._lines_indexes = None
+            self._edges = None
+        else:
+            self._lines_indexes = lines_indexes if lines_indexes is not None else []
+            self._edges = edges if edges is not None else self.polylines_to_edges(self._lines_indexes)
+        if self._packed_faces is not None:
+            self._faces_indexes = None
+        else:
+            self._faces_indexes = faces_indexes if faces_indexes is not None else []
+
+    def load_elements(self):
+        """
+        Cria as listas de índices e os segmentos das polilinhas no formato compacto. Chamada quando o objeto é
+        carregado (ver DisplayFile.normalize_object) e, por garantia, antes de usar os elementos.
+        """
+        if self._packed_lines is not None and self._edges is None:
+            self._lines_indexes = self._packed_lines.tolist()
+            self._edges = self.polylines_to_edges(self._packed_lines)
+        if self._packed_faces is not None and self._faces_indexes is None:
+            self._faces_indexes = self._packed_faces.tolist()
+
+    def release_elements(self):
+        """Libera as listas e os segmentos criados por load_elements; o formato compacto continua disponível"""
+        if self._packed_lines is not None:
+            self._lines_indexes = None
+            self._edges = None
+        if self._packed_faces is not None:
+            self._faces_indexes = None
 
     def draw(
             self,
             context: cairo.Context,
-            viewport_transform: Callable[[Point], Point],
+            viewport_transform: Callable[[np.ndarray], np.ndarray],
             window_min: Point,
             window_max: Point,
-            clipping: Clipping,
+            clipping: Clipping | None,
     ):
-
+        self.load_elements()
         for i in self._point_indexes:
             self._draw_point(
                 context, i, viewport_transform, window_min, window_max, clipping
             )
 
-        for line in self._lines_indexes:
-            self._draw_line(
-                context, line, viewport_transform, window_min, window_max, clipping
-            )
+        self.draw_edges(
+            context, self._edges, viewport_transform, window_min, window_max, clipping
+        )
 
+    def fill(
+            self,
+            context: cairo.Context,
+            viewport_transform: Callable[[np.ndarray], np.ndarray],
+            window_min: Point,
+            window_max: Point,
+            clipping: Clipping | None,
+    ):
+        self.load_elements()
         for face in self._faces_indexes:
             self._draw_face(
                 context, face, viewport_transform, window_min, window_max, clipping
@@ -242,20 +489,23 @@ class WireframeObject(GraphicObject):
     def get_descriptor(self) -> ObjectDescriptor:
         descriptor = super().get_descriptor()
         len_vertices = len(self._points)
-        descriptor.points = [i - len_vertices for i in self._point_indexes]
-
-        new_lines = []
-        for line in self._lines_indexes:
-            new_lines.append([i - len_vertices for i in line])
-        descriptor.lines = new_lines
-
-        new_faces = []
-        for face in self._faces_indexes:
-            new_faces.append([i - len_vertices for i in face])
-        descriptor.faces = new_faces
-
+        # objetos não carregados são exportados do formato compacto, sem manter as listas (ver load_elements)
+        lines = self._lines_indexes if self._lines_indexes is not None else self._packed_lines
+        faces = self._faces_indexes if self._faces_indexes is not None else self._packed_faces
+        descriptor.points = (np.asarray(self._point_indexes, dtype=np.int64) - len_vertices).tolist()
+        descriptor.lines = self.offset_polylines(lines, -len_vertices)
+        descriptor.faces = self.offset_polylines(faces, -len_vertices)
         return descriptor
 
+    @staticmethod
+    def offset_polylines(polylines: List[List[int]] | PackedPolylines, offset: int) -> List[List[int]]:
+        """Soma offset a todos os índices; polilinhas de mesmo tamanho (o caso comum) são deslocadas de uma vez"""
+        if isinstance(polylines, PackedPolylines):
+            return PackedPolylines(polylines.offsets, polylines.indexes.astype(np.int64) + offset).tolist()
+        if polylines and all(len(polyline) == len(polylines[0]) for polyline in polylines):
+            return (np.asarray(polylines, dtype=np.int64) + offset).tolist()
+        return [[i + offset for i in polyline] for polyline in polylines]
+
     def _draw_point(
             self,
             context: cairo.Context,
@@ -263,39 +513,13 @@ class WireframeObject(GraphicObject):
             viewport_transform,
             window_min: Point,
             window_max: Point,
-            clipping: Clipping,
-    ):
-
-        point = self._normalized_points[index]
-        if (not point.ignore) and clipping.clip_point(window_max, window_min, point):
-            new_point = viewport_transform(point)
-            super().draw_line(
-                context, new_point, Point(new_point.x + 1, new_point.y + 1)
-            )
-
-    def _draw_line(
-            self,
-            context: cairo.Context,
-            line_indexes: List[int],
-            viewport_transform,
-            window_min: Point,
-            window_max: Point,
-            clipping: Clipping,
+            clipping: Clipping | None,
     ):
-        last_index, *others = line_indexes
-        for i in others:
-            point1 = self.normalized_points[last_index]
-            point2 = self.normalized_points[i]
-            last_index = i
-
-            if point1.ignore and point2.ignore:
-                continue
 
-            new_line = clipping.clip_line(window_max, window_min, point1, point2)
-            if new_line:
-                initial_point = viewport_transform(new_line[0])
-                end_point = viewport_transform(new_line[1])
-                super().draw_line(context, initial_point, end_point)
+        point = self.get_normalized_point(index)
+        if (not point.ignore) and (clipping is None or clipping.clip_point(window_max, window_min, point)):
+            x, y = viewport_transform(self._normalized_points[index: index + 1])[0].tolist()
+            super().draw_line(context, Point(x, y), Point(x + 1, y + 1))
 
     def _draw_face(
             self,
@@ -304,51 +528,160 @@ class WireframeObject(GraphicObject):
             viewport_transform,
             window_min: Point,
             window_max: Point,
-            clipping: Clipping,
+            clipping: Clipping | None,
     ):
-        context.set_source_rgb(*self._color)
-        normalized_face = [self.normalized_points[i] for i in face_indexes if not self.normalized_points[i].ignore]
-        new_lines = clipping.clip_polygon(normalized_face, window_max, window_min)
+        face = np.asarray(face_indexes)
+        normalized_face = self._normalized_points[face[~self._ignore_mask[face]], :2]
+        if clipping is None:
+            clipped_face = normalized_face
+        else:
+            clipped_face = clipping.clip_polygon(normalized_face, window_max, window_min)
+
+        # todas as faces de uma mesma cor são preenchidas juntas (regra nonzero): mesma orientação para todas,
+        # senão faces sobrepostas com orientações opostas se anulariam
+        x, y = clipped_face[:, 0], clipped_face[:, 1]
+        if np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)) < 0:
+            clipped_face = clipped_face[::-1]
+
+        if len(clipped_face):
+            (x, y), *others = viewport_transform(clipped_face).tolist()
+            context.move_to(x, y)
+            for x, y in others:
+                context.line_to(x, y)
+            context.close_path()
 
-        if new_lines:
-            point1 = viewport_transform(new_lines[0][0])
-            context.move_to(point1.x, point1.y)
 
-            for line in new_lines:
-                point2 = viewport_transform(line[1])
-                context.line_to(point2.x, point2.y)
+class Curve(GraphicObject):
+    """
+    Curva cúbica por partes, tesselada conforme o nível de detalhe (LOD) da visualização.
+
+    Os pontos do objeto são a tesselação atual; os pontos de controle são mantidos para tesselar de novo.
+    O número de passos de cada segmento vem da fórmula de Wang para a tolerância em pixels, com a escala
+    (pixels por unidade do mundo) arredondada para cima em potências de 2: cada potência é um nível de
+    detalhe, e as tesselações de cada nível ficam em cache.
+    """
+
+    TOLERANCE = 0.5  # distância máxima (pixels) entre a curva e a tesselação
+    MAX_STEPS = 256  # passos por segmento
+    # conversão dos pontos de controle de um segmento para os pontos de controle de Bézier equivalentes
+    BEZIER_BASIS_CHANGE = np.identity(4)
+
+    _drawing_step: int  # passos por segmento antes de o nível de detalhe ser conhecido
+    _control_points: np.ndarray  # array (M, 4) de coordenadas homogêneas do mundo
+    _tolerance: float
+    _lod_level: int | None
+    _tessellations: Dict[int, np.ndarray]  # nível de detalhe -> pontos tesselados
+
+    def __init__(self, name: str, points: List[Point], color, drawing_step: int, tolerance: float = None) -> None:
+        self._drawing_step = drawing_step
+        self._control_points = to_homogeneous_array(points)
+        self._tolerance = tolerance if tolerance is not None else self.TOLERANCE
+        self._lod_level = None
+        self._tessellations = {}
+        steps = np.full(len(self.get_segment_indexes()), drawing_step)
+        super().__init__(name, self.tessellate(steps), color)
 
-            context.close_path()
-            context.fill()
+    @property
+    def control_points(self) -> np.ndarray:
+        return self._control_points
 
+    @property
+    def lod_level(self) -> int | None:
+        return self._lod_level
 
-class Curve(GraphicObject):
-    _drawing_step: int
+    @abstractmethod
+    def get_segment_indexes(self) -> np.ndarray:
+        """Array (S, 4) com os índices dos pontos de controle de cada segmento cúbico"""
+        raise NotImplementedError
 
     @abstractmethod
-    def compute_curve_points(self, control_points: List[Point]) -> List[Point]:
+    def compute_curve_points(self, control_points: List[Point], steps: int = None) -> List[Point]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def evaluate_segments(self, segments: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Avalia segmentos com o mesmo número de passos.
+
+        Args:
+            segments: array (S, 4, 3) com os pontos de controle de cada segmento
+            steps: número de passos de cada segmento
+
+        Returns:
+            array (S, steps + 1, 3) de pontos da curva
+        """
         raise NotImplementedError
 
+    def get_segment_tensor(self) -> np.ndarray:
+        """Array (S, 4, 3) com os pontos de controle de cada segmento"""
+        return self._control_points[self.get_segment_indexes(), :3]
+
+    def tessellate(self, steps: np.ndarray) -> np.ndarray:
+        """
+        Tessela cada segmento com o seu número de passos (segmentos com o mesmo número são avaliados juntos);
+        segmentos consecutivos compartilham o ponto de junção.
+        """
+        segments = self.get_segment_tensor()
+        if len(segments) == 0:
+            return np.empty((0, 4))
+        # cada segmento começa no ponto final do anterior (a junção é escrita pelos dois, com o mesmo valor)
+        starts = np.cumsum(steps) - steps
+        points = np.ones((starts[-1] + steps[-1] + 1, 4))
+        for segment_steps in np.unique(steps).tolist():
+            group = np.flatnonzero(steps == segment_steps)
+            rows = starts[group, np.newaxis] + np.arange(segment_steps + 1)
+            points[rows, :3] = self.evaluate_segments(segments[group], segment_steps)
+        return points
+
+    def compute_steps(self, pixel_scale: float) -> np.ndarray:
+        """
+        Passos de cada segmento pela fórmula de Wang: n = sqrt(d(d - 1) / 8 * M / tolerância), com d = 3 e M o
+        maior módulo das segundas diferenças dos pontos de controle de Bézier, em pixels.
+        """
+        segments = self.get_segment_tensor()
+        if len(segments) == 0:
+            return np.empty(0, dtype=int)
+        bezier = np.einsum("ij,sjk->sik", self.BEZIER_BASIS_CHANGE, segments)
+        second_differences = bezier[:, :-2] - 2 * bezier[:, 1:-1] + bezier[:, 2:]
+        m = np.linalg.norm(second_differences, axis=2).max(axis=1) * pixel_scale
+        steps = np.ceil(np.sqrt(0.75 * m / self._tolerance))
+        return np.clip(steps, 1, self.MAX_STEPS).astype(int)
+
+    def set_lod_level(self, level: int) -> np.ndarray | None:
+        """
+        Returns:
+            os pontos tesselados para o nível de detalhe, ou None se o nível não mudou
+        """
+        if level == self._lod_level:
+            return None
+        self._lod_level = level
+        if level not in self._tessellations:
+            self._tessellations[level] = self.tessellate(self.compute_steps(2.0 ** level))
+        return self._tessellations[level]
+
+    def update_control_points(self, new_points: np.ndarray):
+        """
+        Substitui os pontos de controle (após uma transformação do objeto, que já transforma os pontos tesselados
+        atuais junto). As tesselações em cache deixam de valer, e a escala pode ter mudado o número de passos
+        necessário: a curva é tesselada de novo na próxima escolha de nível de detalhe.
+        """
+        self._control_points = to_homogeneous_array(new_points)
+        self._tessellations.clear()
+        self._lod_level = None
+
     def draw(
             self,
             context: cairo.Context,
-            viewport_transform: Callable[[Point], Point],
+            viewport_transform: Callable[[np.ndarray], np.ndarray],
             window_min: Point,
             window_max: Point,
-            clipping: Clipping,
+            clipping: Clipping | None,
     ):
-        last_point, *others = self.normalized_points
-        for next_point in others:
-            if last_point.ignore and next_point.ignore:
-                continue
-            new_line = clipping.clip_line(
-                window_max, window_min, last_point, next_point
-            )
-            if new_line:
-                initial_point = viewport_transform(new_line[0])
-                end_point = viewport_transform(new_line[1])
-                super().draw_line(context, initial_point, end_point)
-            last_point = next_point
+        indexes = np.arange(len(self._normalized_points))
+        edges = np.column_stack((indexes[:-1], indexes[1:]))
+        self.draw_edges(
+            context, edges, viewport_transform, window_min, window_max, clipping
+        )
 
     def get_descriptor(self) -> ObjectDescriptor:
         descriptor = super().get_descriptor()
@@ -359,281 +692,156 @@ class Curve(GraphicObject):
 
 class BezierCurve(Curve):
 
-    def __init__(self, name: str, points: List[Point], color, drawing_step=30) -> None:
-        self._drawing_step = drawing_step
-        n_control_points = len(points)
-        real_points = []
-        for i in range(0, n_control_points - 3, 3):
-            # Cria curvas a cada 4 pontos para garantir continuidade G(0):
-            p = self.compute_curve_points(points[i: i + 4])
-            real_points.extend(p)  # Concatena os pontos calculados
+    def __init__(self, name: str, points: List[Point], color, drawing_step=30, tolerance: float = None) -> None:
+        super().__init__(name, points, color, drawing_step, tolerance)
 
-        super().__init__(name, real_points, color)
+    def get_segment_indexes(self) -> np.ndarray:
+        # Cria curvas a cada 4 pontos para garantir continuidade G(0):
+        n_segments = max((len(self._control_points) - 1) // 3, 0)
+        return 3 * np.arange(n_segments)[:, np.newaxis] + np.arange(4)
 
-    def compute_curve_points(self, control_points: List[Point]) -> List[Point]:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_basis(steps: int) -> np.ndarray:
+        """Matriz (steps + 1, 4) T·M, com as linhas [1, t, t^2, t^3] para t de 0 a 1; em cache por número de passos"""
         # Matriz da curva de Bézier cúbica
         m = np.array([[1, 0, 0, 0], [-3, 3, 0, 0], [3, -6, 3, 0], [-1, 3, -3, 1]])
-        computed_points = []
-
-        geometry_matrix_x = np.array([[control_points[i].x] for i in range(4)])
-        geometry_matrix_y = np.array([[control_points[i].y] for i in range(4)])
-
-        for val in range(self._drawing_step + 1):  # `val` vai de 0 a drawing_step
-            t = val / self._drawing_step  # Corrigir t para variar entre 0 e 1
-
-            # Vetor [1, t, t^2, t^3]
-            t_matrix = np.array([1, t, t * t, t * t * t])
-            t_m_matrix = t_matrix @ m  # Multiplica t pela matriz da curva
+        t = np.linspace(0, 1, steps + 1)
+        basis = np.vander(t, 4, increasing=True) @ m
+        basis.flags.writeable = False  # compartilhada entre todas as curvas
+        return basis
 
-            # Calcula as coordenadas x e y
-            x_value = t_m_matrix @ geometry_matrix_x
-            y_value = t_m_matrix @ geometry_matrix_y
+    def evaluate_segments(self, segments: np.ndarray, steps: int) -> np.ndarray:
+        # (passos + 1, 4) x (S, 4, 3) -> (S, passos + 1, 3)
+        return np.matmul(self.get_basis(steps), segments)
 
-            computed_points.append(Point(x_value[0], y_value[0]))
-
-        return computed_points
+    def compute_curve_points(self, control_points: List[Point], steps: int = None) -> List[Point]:
+        steps = steps if steps is not None else self._drawing_step
+        segment = np.array([[p.x, p.y, p.z] for p in control_points[:4]])
+        return [Point(x, y, z) for x, y, z in (self.get_basis(steps) @ segment).tolist()]
 
 
 class BSplineCurve(Curve):
+    # pontos de controle de Bézier de um segmento da B-Spline uniforme cúbica
+    BEZIER_BASIS_CHANGE = np.array([[1, 4, 1, 0], [0, 4, 2, 0], [0, 2, 4, 0], [0, 1, 4, 1]]) / 6
 
-    def __init__(self, name: str, points: List[Point], color, drawing_step=15) -> None:
-        self._drawing_step = drawing_step
-        n_control_points = len(points)
+    def __init__(self, name: str, points: List[Point], color, drawing_step=15, tolerance: float = None) -> None:
+        super().__init__(name, points, color, drawing_step, tolerance)
 
+    def get_segment_indexes(self) -> np.ndarray:
         # Calcula segmentos da B-Spline utilizando blocos de 4 pontos consecutivos
-        real_points = []
-        for i in range(n_control_points - 3):
-            p = self.compute_curve_points(points[i: i + 4])
-            real_points.extend(p)
-
-        super().__init__(name, real_points, color)
-
-    def compute_curve_points(self, control_points: List[Point]) -> List[Point]:
-        computed_points = []
+        n_segments = max(len(self._control_points) - 3, 0)
+        return np.arange(n_segments)[:, np.newaxis] + np.arange(4)
 
-        # Matriz da B-Spline cúbica usando np.array
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_basis(steps: int) -> np.ndarray:
+        """Matriz (steps + 1, 4) T·M da B-Spline uniforme cúbica, para t de 0 a 1; em cache por número de passos"""
+        # Matriz da B-Spline cúbica, com as linhas na ordem [1, t, t^2, t^3]
         b_spline_matrix = (1 / 6) * np.array(
-            [[-1, 3, -3, 1], [3, -6, 3, 0], [-3, 0, 3, 0], [1, 4, 1, 0]]
-        )
-
-        delta = 1 / self._drawing_step
-
-        # Matriz de diferenças forward
-        diff_matrix = np.array(
-            [
-                [0, 0, 0, 1],
-                [delta ** 3, delta ** 2, delta, 0],
-                [6 * delta ** 3, 2 * delta ** 2, 0, 0],
-                [6 * delta ** 3, 0, 0, 0],
-            ]
+            [[1, 4, 1, 0], [-3, 0, 3, 0], [3, -6, 3, 0], [-1, 3, -3, 1]]
         )
+        t = np.linspace(0, 1, steps + 1)
+        basis = np.vander(t, 4, increasing=True) @ b_spline_matrix
+        basis.flags.writeable = False  # compartilhada entre todas as curvas e superfícies
+        return basis
 
-        p1, p2, p3, p4 = control_points
+    def evaluate_segments(self, segments: np.ndarray, steps: int) -> np.ndarray:
+        # (passos + 1, 4) x (S, 4, 3) -> (S, passos + 1, 3)
+        return np.matmul(self.get_basis(steps), segments)
 
-        g_matrix_x = np.array([[p1.x], [p2.x], [p3.x], [p4.x]])
-        g_matrix_y = np.array([[p1.y], [p2.y], [p3.y], [p4.y]])
+    def compute_curve_points(self, control_points: List[Point], steps: int = None) -> List[Point]:
+        steps = steps if steps is not None else self._drawing_step
+        segment = np.array([[p.x, p.y, p.z] for p in control_points[:4]])
+        return [Point(x, y, z) for x, y, z in (self.get_basis(steps) @ segment).tolist()]
 
-        # Multiplica a matriz de controle pelos coeficientes da B-Spline
-        coeff_matrix_x = b_spline_matrix @ g_matrix_x
-        coeff_matrix_y = b_spline_matrix @ g_matrix_y
 
-        # Aplica Forward Differences para as coordenadas x e y
-        initial_conditions_matrix_x = diff_matrix @ coeff_matrix_x
-        initial_conditions_matrix_y = diff_matrix @ coeff_matrix_y
-
-        new_x = initial_conditions_matrix_x[0, 0]
-        new_y = initial_conditions_matrix_y[0, 0]
-
-        delta_x = initial_conditions_matrix_x[1, 0]
-        delta2_x = initial_conditions_matrix_x[2, 0]
-        delta3_x = initial_conditions_matrix_x[3, 0]
-
-        delta_y = initial_conditions_matrix_y[1, 0]
-        delta2_y = initial_conditions_matrix_y[2, 0]
-        delta3_y = initial_conditions_matrix_y[3, 0]
-
-        # Adiciona o primeiro ponto calculado
-        computed_points.append(Point(new_x, new_y))
-
-        # Calcula os próximos pontos incrementando as diferenças
-        for _ in range(self._drawing_step):
-            new_x += delta_x
-            new_y += delta_y
-
-            delta_x += delta2_x
-            delta_y += delta2_y
-
-            delta2_x += delta3_x
-            delta2_y += delta3_y
-
-            computed_points.append(Point(new_x, new_y))
-
-        return computed_points
+class Surface(WireframeObject):
+    """
+    Superfície bicúbica por retalhos (blocos 4x4 da rede de pontos de controle), desenhada como uma grade de
+    isolinhas com vértices compartilhados.
+    """
 
+    PATCH_STRIDE = 1  # distância, na rede de controle, entre o início de dois retalhos vizinhos
+    _drawing_step: int
 
-class BezierSurface(WireframeObject):
-    def __init__(self, name: str, control_points: List[List[Point]], color, drawing_step=15) -> None:
+    def __init__(
+            self, name: str, control_points: List[List[Point]], color, wtype: ObjectType, drawing_step: int
+    ) -> None:
+        Validation.surface_control_points_input(control_points, wtype)
         self._drawing_step = drawing_step
-        line_indexes = self.save_indexes()
-        surface_points = self.compute_surface_points(control_points)  # Gera os pontos da superfície
-        super().__init__(name, surface_points, color, wtype=ObjectType.BEZIER_SURFACE, lines_indexes=line_indexes)
-
-    def compute_surface_points(self, points) -> List[Point]:
-        # Matriz de Bézier cúbica
-        m = np.array([[1, 0, 0, 0], [-3, 3, 0, 0], [3, -6, 3, 0], [-1, 3, -3, 1]])
-        computed_points = []
-
-        # Criação das matrizes de coordenadas
-        geometry_matrix_x = np.array([[p.x for p in row] for row in points])
-        geometry_matrix_y = np.array([[p.y for p in row] for row in points])
-        geometry_matrix_z = np.array([[p.z for p in row] for row in points])
-
-        # Calcular pontos na superfície
-        for i in range(self._drawing_step + 1):
-            s = i / self._drawing_step
-            s_vector = np.array([1, s, s ** 2, s ** 3]) @ m  # Multiplicação do vetor de parâmetro pela matriz Bézier
-
-            for j in range(self._drawing_step + 1):
-                t = j / self._drawing_step
-                t_vector = m.T @ np.array([[1], [t], [t ** 2], [t ** 3]])  # Vetor de parâmetro transposto
-
-                # Calcular coordenadas x, y, z usando a multiplicação das matrizes
-                x_value = s_vector @ geometry_matrix_x @ t_vector
-                y_value = s_vector @ geometry_matrix_y @ t_vector
-                z_value = s_vector @ geometry_matrix_z @ t_vector
-
-                # Os resultados são arrays 1D, então pegamos o primeiro elemento
-                computed_points.append(Point(x_value[0], y_value[0], z_value[0]))
+        points, rows, columns = self.compute_surface_grid(to_homogeneous_array(
+            [point for row in control_points for point in row]
+        ).reshape(len(control_points), -1, 4))
+        edges = np.concatenate((self.polylines_to_edges(rows), self.polylines_to_edges(columns)))
+        super().__init__(
+            name,
+            points,
+            color,
+            wtype=wtype,
+            lines_indexes=rows.tolist() + columns.tolist(),
+            edges=edges,
+        )
 
-        return computed_points
+    @staticmethod
+    @abstractmethod
+    def get_basis(steps: int) -> np.ndarray:
+        """Matriz (steps + 1, 4) T·M da base nas direções s e t"""
+        raise NotImplementedError
 
-    def save_indexes(self):
-        lines = []
-        # Número de pontos por linha (isso depende do número de passos no cálculo)
-        n_points = self._drawing_step + 1
+    def compute_surface_grid(self, control_net: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Avalia todos os retalhos da superfície de uma vez: P(s, t) = B G Bᵀ, com B a base para drawing_step passos.
+        As amostras formam uma única grade para a superfície inteira: retalhos vizinhos compartilham as amostras da
+        borda, e as isolinhas s e t compartilham os vértices.
+
+        Args:
+            control_net: array (linhas, colunas, 3 ou 4) de pontos de controle
+
+        Returns:
+            (array (H * W, 3) com os pontos da grade, em ordem de linha,
+             array (H, W) com os índices de cada linha da grade (isolinhas com s constante),
+             array (W, H) com os índices de cada coluna da grade (isolinhas com t constante))
+        """
+        step = self._drawing_step
+        if control_net.shape[0] < 4 or control_net.shape[1] < 4:
+            return np.empty((0, 3)), np.empty((0, 0), dtype=np.intp), np.empty((0, 0), dtype=np.intp)
+        basis = self.get_basis(step)
+        # (retalhos em linha, retalhos em coluna, 3, 4, 4): blocos 4x4 de pontos de controle
+        windows = np.lib.stride_tricks.sliding_window_view(control_net[:, :, :3], (4, 4), axis=(0, 1))
+        patches = windows[:: self.PATCH_STRIDE, :: self.PATCH_STRIDE]
+        grids = np.einsum("ak,ijckl,bl->ijabc", basis, patches, basis)
+        patch_rows, patch_columns = grids.shape[:2]
+
+        # o retalho (i, j) ocupa as linhas [i * step, i * step + step] e colunas [j * step, j * step + step]
+        height, width = patch_rows * step + 1, patch_columns * step + 1
+        samples = np.arange(step + 1)
+        grid_rows = (np.arange(patch_rows) * step)[:, np.newaxis, np.newaxis, np.newaxis] + samples[:, np.newaxis]
+        grid_columns = (np.arange(patch_columns) * step)[np.newaxis, :, np.newaxis, np.newaxis] + samples
+        grid = np.empty((height, width, 3))
+        grid[grid_rows, grid_columns] = grids
+
+        indexes = np.arange(height * width).reshape(height, width)
+        return grid.reshape(-1, 3), indexes, indexes.T
+
+
+class BezierSurface(Surface):
+    """Rede de controle (3n + 1) x (3m + 1): retalhos vizinhos compartilham a linha/coluna de pontos da borda"""
+
+    PATCH_STRIDE = 3
 
-        for i in range(n_points):
-            start_index = i * n_points
-            for j in range(n_points - 1):
-                # horizontal lines
-                horizontal = start_index + j
-                lines.append([horizontal, horizontal + 1])
-                # vertical lines
-                lines.append([(i + j * n_points), (i + (j + 1) * n_points)])
+    def __init__(self, name: str, control_points: List[List[Point]], color, drawing_step=15) -> None:
+        super().__init__(name, control_points, color, ObjectType.BEZIER_SURFACE, drawing_step)
 
-        # [[a, b], [b, c]]
-        return lines
+    @staticmethod
+    def get_basis(steps: int) -> np.ndarray:
+        return BezierCurve.get_basis(steps)
 
 
-class BSplineSurface(WireframeObject):
+class BSplineSurface(Surface):
     def __init__(self, name: str, control_points: List[List[Point]], color, drawing_step=6) -> None:
-        self._drawing_step = drawing_step
-        surface_curves = self.compute_surface_curves(control_points)
-        points, lines_indexes = self.curves_to_graphic_obj(surface_curves)
-        super().__init__(name, points, color, wtype=ObjectType.BSPLINE_SURFACE, lines_indexes=lines_indexes)
-
-    def compute_surface_curves(self, control_points) -> List[List[Point]]:
-        # Matriz da B-Spline cúbica
-        b_spline_matrix = (1 / 6) * np.array([[-1, 3, -3, 1], [3, -6, 3, 0], [-3, 0, 3, 0], [1, 4, 1, 0]])
-        delta = 1 / self._drawing_step
-        # Matriz de diferenças forward -> S e T tem o mesmo passo, então são iguais
-        diff_matrix = np.array(
-            [
-                [0, 0, 0, 1],
-                [delta ** 3, delta ** 2, delta, 0],
-                [6 * delta ** 3, 2 * delta ** 2, 0, 0],
-                [6 * delta ** 3, 0, 0, 0],
-            ]
-        )
-        curves = []
-        # Para cada bloco de 4x4 pontos de controle, computa a superfície
-        for i in range(len(control_points) - 3):
-            for j in range(len(control_points[i]) - 3):
-                # Extrai os pontos de controle para o patch atual
-                g_matrix_x = np.array([[control_points[i + m][j + n].x for n in range(4)] for m in range(4)])
-                g_matrix_y = np.array([[control_points[i + m][j + n].y for n in range(4)] for m in range(4)])
-                g_matrix_z = np.array([[control_points[i + m][j + n].z for n in range(4)] for m in range(4)])
-
-                # Calcula os coeficientes da superfície
-                coeff_matrix_x = b_spline_matrix @ g_matrix_x @ b_spline_matrix.T
-                coeff_matrix_y = b_spline_matrix @ g_matrix_y @ b_spline_matrix.T
-                coeff_matrix_z = b_spline_matrix @ g_matrix_z @ b_spline_matrix.T
-
-                # Matriz de condições iniciais para a direção s
-                dd_matrix_x = diff_matrix @ coeff_matrix_x @ diff_matrix.T
-                dd_matrix_y = diff_matrix @ coeff_matrix_y @ diff_matrix.T
-                dd_matrix_z = diff_matrix @ coeff_matrix_z @ diff_matrix.T
-
-                curves_s = self.draw_curves_in_one_direction(dd_matrix_x, dd_matrix_y, dd_matrix_z)
-                curves.extend(curves_s)
-
-                # Para outra direção (transposta)
-                dd_matrix_x = (diff_matrix @ coeff_matrix_x @ diff_matrix.T).T
-                dd_matrix_y = (diff_matrix @ coeff_matrix_y @ diff_matrix.T).T
-                dd_matrix_z = (diff_matrix @ coeff_matrix_z @ diff_matrix.T).T
-
-                curves_t = self.draw_curves_in_one_direction(dd_matrix_x, dd_matrix_y, dd_matrix_z)
-                curves.extend(curves_t)
-
-        return curves
-
-    def update_dd_matrix(self, DD_x, DD_y, DD_z):
-        for i in range(3):
-            for j in range(4):
-                DD_x[i][j] += DD_x[i + 1][j]
-                DD_y[i][j] += DD_y[i + 1][j]
-                DD_z[i][j] += DD_z[i + 1][j]
-        return DD_x, DD_y, DD_z
-
-    def draw_curves_in_one_direction(self, dd_matrix_x, dd_matrix_y, dd_matrix_z):
-        curves = []
-        for _ in range(self._drawing_step):
-            curve = self.draw_curve_foward_differences(
-                dd_matrix_x[0][0], dd_matrix_x[0][1], dd_matrix_x[0][2], dd_matrix_x[0][3],
-                dd_matrix_y[0][0], dd_matrix_y[0][1], dd_matrix_y[0][2], dd_matrix_y[0][3],
-                dd_matrix_z[0][0], dd_matrix_z[0][1], dd_matrix_z[0][2], dd_matrix_z[0][3]
-            )
-            curves.append(curve)
-            dd_matrix_x, dd_matrix_y, dd_matrix_z = self.update_dd_matrix(dd_matrix_x, dd_matrix_y, dd_matrix_z)
-
-        # Última curva necessária
-        curve = self.draw_curve_foward_differences(
-            dd_matrix_x[0][0], dd_matrix_x[0][1], dd_matrix_x[0][2], dd_matrix_x[0][3],
-            dd_matrix_y[0][0], dd_matrix_y[0][1], dd_matrix_y[0][2], dd_matrix_y[0][3],
-            dd_matrix_z[0][0], dd_matrix_z[0][1], dd_matrix_z[0][2], dd_matrix_z[0][3]
-        )
-        curves.append(curve)
-        return curves
-
-    # DesenhaCurvaFwdDiff( n, x, Dx, D2x, D3x, y, Dy,D2y, D3y, z, Dz, D2z, D3z)
-    # Mesmo algoritmo utilizado em BSplineCurve
-    def draw_curve_foward_differences(self, x, delta_x, delta2_x, delta3_x,
-                                      y, delta_y, delta2_y, delta3_y,
-                                      z, delta_z, delta2_z, delta3_z):
-        curve_points = [Point(x, y, z)]
-        for _ in range(self._drawing_step):
-            x += delta_x
-            y += delta_y
-            z += delta_z
-            delta_x += delta2_x
-            delta_y += delta2_y
-            delta_z += delta2_z
-            delta2_x += delta3_x
-            delta2_y += delta3_y
-            delta2_z += delta3_z
-            curve_points.append(Point(x, y, z))
-        return curve_points
-
-    def curves_to_graphic_obj(self, curves: List[List[Point]]):
-        points = []
-        lines_indexes = []
-        point_to_index = {}
-        for curve in curves:
-            line_indexes = []
-            for point in curve:
-                if point not in point_to_index:
-                    point_to_index[point] = len(points)
-                    points.append(point)
-                line_indexes.append(point_to_index[point])
-            lines_indexes.append(line_indexes)
-        return points, lines_indexes
+        super().__init__(name, control_points, color, ObjectType.BSPLINE_SURFACE, drawing_step)
+
+    @staticmethod
+    def get_basis(steps: int) -> np.ndarray:
+        return BSplineCurve.get_basis(steps)
@@ -0,0 +1,118 @@
+from typing import Dict, List
+
+import numpy as np
+
+
+class SpatialIndex:
+    """
+    Índice espacial (BVH de dois níveis) sobre as caixas envolventes dos objetos no mundo.
+
+    As caixas são agrupadas em folhas de até LEAF_SIZE objetos por divisões recursivas na mediana do maior eixo.
+    Uma consulta testa todas as folhas contra os planos do volume de visualização de uma vez e, depois, só os
+    objetos das folhas que passaram. Inserções reconstroem o índice na próxima consulta; atualizações de um
+    objeto só reajustam a caixa da sua folha.
+    """
+
+    LEAF_SIZE = 32
+
+    _ids: List[int]  # posição -> id do objeto
+    _positions: Dict[int, int]  # id do objeto -> posição
+    _boxes: np.ndarray  # (capacidade, 6): (min_x, min_y, min_z, max_x, max_y, max_z)
+    _order: np.ndarray  # posições agrupadas por folha
+    _leaf_ranges: np.ndarray  # (folhas, 2): intervalo [início, fim) de cada folha em _order
+    _leaf_boxes: np.ndarray  # (folhas, 6)
+    _leaf_of: np.ndarray  # posição -> folha
+    _dirty: bool
+
+    def __init__(self) -> None:
+        self._ids = []
+        self._positions = {}
+        self._boxes = np.empty((64, 6))
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._ids)
+
+    def insert(self, obj_id: int, bbox: np.ndarray):
+        if len(self._ids) == len(self._boxes):
+            boxes = self._boxes
+            self._boxes = np.empty((2 * len(boxes), 6))
+            self._boxes[: len(boxes)] = boxes
+        position = len(self._ids)
+        self._ids.append(obj_id)
+        self._positions[obj_id] = position
+        self._boxes[position] = bbox
+        self._dirty = True
+
+    def update(self, obj_id: int, bbox: np.ndarray):
+        position = self._positions[obj_id]
+        self._boxes[position] = bbox
+        if not self._dirty:
+            leaf = self._leaf_of[position]
+            start, end = self._leaf_ranges[leaf]
+            self._leaf_boxes[leaf] = self._union(self._boxes[self._order[start:end]])
+
+    def query(self, planes: np.ndarray) -> List[int]:
+        """
+        Args:
+            planes: array (P, 4) de planos (a, b, c, d) no mundo, com o lado de dentro em ax + by + cz + d >= 0
+
+        Returns:
+            ids dos objetos cujas caixas não estão inteiramente fora de algum plano, em ordem de inserção
+        """
+        if not self._ids:
+            return []
+        if self._dirty:
+            self._build()
+
+        visible_leaves = np.flatnonzero(self._boxes_inside(self._leaf_boxes, planes))
+        if len(visible_leaves) == 0:
+            return []
+        candidates = np.concatenate([self._order[start:end] for start, end in self._leaf_ranges[visible_leaves]])
+        visible = np.sort(candidates[self._boxes_inside(self._boxes[candidates], planes)])
+        return [self._ids[position] for position in visible.tolist()]
+
+    @staticmethod
+    def _boxes_inside(boxes: np.ndarray, planes: np.ndarray) -> np.ndarray:
+        """Teste conservador caixa x planos: para cada plano, usa o vértice da caixa mais à frente da normal"""
+        normals = planes[:, :3]
+        # (caixas, planos, 3): para normal positiva usa o máximo da caixa, senão o mínimo
+        vertices = np.where(normals >= 0, boxes[:, np.newaxis, 3:], boxes[:, np.newaxis, :3])
+        with np.errstate(invalid="ignore"):  # caixas de objetos vazios (inf) dão nan, e nan não é descartado
+            distances = np.einsum("bpk,pk->bp", vertices, normals) + planes[:, 3]
+            return ~np.any(distances < 0, axis=1)
+
+    @staticmethod
+    def _union(boxes: np.ndarray) -> np.ndarray:
+        return np.concatenate((boxes[:, :3].min(axis=0), boxes[:, 3:].max(axis=0)))
+
+    def _build(self):
+        """Divide as caixas recursivamente na mediana do centro, pelo eixo de maior extensão"""
+        count = len(self._ids)
+        boxes = self._boxes[:count]
+        with np.errstate(invalid="ignore"):  # caixas de objetos vazios (inf + -inf) dão nan, zerado abaixo
+            centers = np.nan_to_num((boxes[:, :3] + boxes[:, 3:]) / 2)
+        order = np.arange(count)
+        leaf_ranges = []
+
+        stack = [(0, count)]
+        while stack:
+            start, end = stack.pop()
+            if end - start <= self.LEAF_SIZE:
+                leaf_ranges.append((start, end))
+                continue
+            items = order[start:end]
+            item_centers = centers[items]
+            axis = np.argmax(item_centers.max(axis=0) - item_centers.min(axis=0))
+            half = (end - start) // 2
+            order[start:end] = items[np.argpartition(item_centers[:, axis], half)]
+            stack.append((start + half, end))
+            stack.append((start, start + half))
+
+        self._order = order
+        self._leaf_ranges = np.array(leaf_ranges, dtype=np.intp)
+        self._leaf_boxes = np.array([self._union(boxes[order[start:end]]) for start, end in leaf_ranges])
+        self._leaf_of = np.empty(count, dtype=np.intp)
+        for leaf, (start, end) in enumerate(leaf_ranges):
+            self._leaf_of[order[start:end]] = leaf
+        self._dirty = False
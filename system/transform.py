@@ -3,30 +3,56 @@ from typing import Any, Dict
 import numpy as np
 
 from globals import RotationType, TransformationType, TranslationType
-from system.basics import Point
+from system.basics import Point, to_homogeneous_array
 from system.objects import GraphicObject
 from utils import get_tuple_from_object, get_tuple_from_str
 
 
 class Transformation:
     _normalizing_matrix: np.array
+    _cop_distance: float
 
     def __init__(self) -> None:
         self._normalizing_matrix = np.identity(4)
+        self._cop_distance = 1
 
     @property
     def normalizing_matrix(self):
         return self._normalizing_matrix
 
+    @property
+    def cop_distance(self):
+        return self._cop_distance
+
     @staticmethod
     def get_transformed_points(
             graphic_object: GraphicObject,
             transform_input: Dict[TransformationType, Any],
             window_rotation: np.array,
             window_center: Point,
-    ) -> list[Point]:
+    ) -> np.ndarray:
         """
-        Dada a entrada e os dados do objeto, retorna novos pontos com as transformações aplicadas.
+        Dada a entrada e os dados do objeto, retorna novos pontos (array (N, 4)) com as transformações aplicadas.
+        """
+        transforming_matrix = Transformation.get_transforming_matrix(
+            graphic_object, transform_input, window_rotation, window_center
+        )
+        if np.array_equal(transforming_matrix, np.identity(4)):
+            return graphic_object.points
+        else:
+            return Transformation.transform_array(
+                graphic_object.points, transforming_matrix
+            )
+
+    @staticmethod
+    def get_transforming_matrix(
+            graphic_object: GraphicObject,
+            transform_input: Dict[TransformationType, Any],
+            window_rotation: np.array,
+            window_center: Point,
+    ) -> np.ndarray:
+        """
+        Dada a entrada e os dados do objeto, retorna a matriz (4, 4) que compõe as transformações.
         """
         identity_matrix = np.identity(4)
         transforming_matrix = identity_matrix
@@ -48,13 +74,7 @@ class Transformation:
             transform_input[TransformationType.ROTATION],
             graphic_object.center,
         )
-
-        if np.array_equal(transforming_matrix, identity_matrix):
-            return graphic_object.points
-        else:
-            return Transformation.transform_points(
-                graphic_object.points, transforming_matrix
-            )
+        return transforming_matrix
 
     @staticmethod
     def apply_translation(
@@ -170,14 +190,26 @@ class Transformation:
                 )
         return curr_matrix @ rotation_matrix
 
+    @staticmethod
+    def transform_array(vertices: np.ndarray, matrix: np.array, out: np.ndarray = None) -> np.ndarray:
+        """
+        Applies a 4x4 matrix to a whole vertex array in a single matmul.
+
+        Args:
+            vertices: array (N, 4) of homogeneous coordinates (one vertex per row)
+            matrix: 4x4 transformation matrix
+            out: optional preallocated (N, 4) array to write the result into
+
+        Returns:
+            transformed array (N, 4)
+        """
+        # (M @ v^T)^T == v @ M^T: evita transpor o array de vértices
+        return np.matmul(vertices, matrix.T, out=out)
+
     @staticmethod
     def transform_points(points: list[Point], matrix: np.array) -> list[Point]:
-        result = []
-        for point in points:
-            coord = matrix @ np.array(point.get_homogeneous_matrix())
-            new_point = Point(coord[0, 0], coord[1, 0], coord[2, 0])
-            result.append(new_point)
-        return result
+        vertices = Transformation.transform_array(to_homogeneous_array(points), matrix)
+        return Point.array_to_list(vertices)
 
     @staticmethod
     def get_rotation_about_axis(
@@ -416,7 +448,7 @@ class Transformation:
     def set_normalizing_matrix(self, window, cop_distance=1) -> np.array:
         """Normaliza considerando projeção em perspectiva"""
 
-        window_size = Point.size(window.points[0], window.points[3])
+        window_size = Point.size(window.get_point(0), window.get_point(3))
         x, y, z = window.center
 
         tr_to_origin = Transformation.get_translation_matrix(-x, -y, -z)
@@ -430,4 +462,55 @@ class Transformation:
 
         #  As transformações são aplicadas na ordem invertida
         self._normalizing_matrix = scale @ tr_cop_to_origin @ rotate @ tr_to_origin
+        self._cop_distance = cop_distance
         return self._normalizing_matrix
+
+    def get_frustum_planes(self, window_min: Point, window_max: Point) -> np.ndarray:
+        """
+        Builds the world-space planes of the viewing frustum (perspective projection of the window).
+
+        Args:
+            window_min: lower-left corner of the window in normalized coordinates
+            window_max: upper-right corner of the window in normalized coordinates
+
+        Returns:
+            array (5, 4) of planes (a, b, c, d), with the inside at ax + by + cz + d >= 0
+        """
+        cop = self._cop_distance
+        # no sistema normalizado (antes da divisão por z): min <= cop * x / z <= max e z >= 0
+        planes = np.array(
+            [
+                [cop, 0, -window_min.x, 0],
+                [-cop, 0, window_max.x, 0],
+                [0, cop, -window_min.y, 0],
+                [0, -cop, window_max.y, 0],
+                [0, 0, 1, 0],
+            ]
+        )
+        return planes @ self._normalizing_matrix
+
+    def normalize_array(
+            self, vertices: np.ndarray, out: np.ndarray = None, ignore_out: np.ndarray = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Normalizes and projects (perspective) a whole vertex array at once.
+
+        Args:
+            vertices: array (N, 4) of world homogeneous coordinates
+            out: optional preallocated (N, 4) array for the normalized coordinates
+            ignore_out: optional preallocated (N,) boolean array for the ignore mask
+
+        Returns:
+            (normalized array (N, 4), mask of points behind the center of projection)
+        """
+        out = Transformation.transform_array(vertices, self._normalizing_matrix, out=out)
+        z = out[:, 2]
+        ignore = np.less_equal(z, 0, out=ignore_out)
+
+        # pontos atrás do centro de projeção viram (0, 0) e são marcados para serem ignorados
+        factor = np.divide(self._cop_distance, z, out=np.zeros_like(z), where=~ignore)
+        out[:, 0] *= factor
+        out[:, 1] *= factor
+        out[:, 2] = 0.0
+        out[:, 3] = 1.0
+        return out, ignore
@@ -1,27 +1,31 @@
-from typing import Any, Dict
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Tuple
 
 import cairo
 import numpy as np
 
-from globals import LineClippingType, ObjectType, TransformationType
-from system.basics import Point
+from globals import (NORMALIZED_MEMORY_BUDGET, LineClippingType, ObjectType,
+                     TransformationType)
+from system.basics import Point, to_homogeneous_array
+from system.buffers import SceneBuffer
 from system.clipping import Clipping
 from system.files import ObjectDescriptor
 from system.objects import (BezierCurve, BezierSurface, BSplineCurve,
-                            BSplineSurface, GraphicObject, LineSegmentObject,
-                            PointObject, WireframeObject)
+                            BSplineSurface, Curve, GraphicObject,
+                            LineSegmentObject, PointObject, WireframeObject)
+from system.spatial import SpatialIndex
 from system.transform import Transformation
 
 
 class Window(GraphicObject):
-    _points: list[Point]  # no caso da Window, só tem 2 pontos da diagonal:
-    #                       o canto inferior esquerdo e o canto superior direito
+    _points: np.ndarray  # no caso da Window, são os 4 cantos (Xmin, Ymin), (Xmin, Ymax), (Xmax, Ymax), (Xmax, Ymin)
 
     _name: str
     _center: Point
     _type: ObjectType
     _color: tuple
-    _normalized_points: list[Point]
+    _normalized_points: np.ndarray
     _normalized_center: Point
     _rotation_matrix: np.array
     _scale_x: float
@@ -36,12 +40,15 @@ class Window(GraphicObject):
         # coordenadas da window vão ser sempre [(Xmin, Ymin), (Xmin, Ymax), (Xmax, Ymax), (Xmax, Ymin),]
         super().__init__("Window", points, color)
         self._type = ObjectType.WIREFRAME_POLYGON
-        self._normalized_points = [
-            Point(-1, -1),
-            Point(-1, 1),
-            Point(1, 1),
-            Point(1, -1),
-        ]
+        self._normalized_points = to_homogeneous_array(
+            [
+                Point(-1, -1),
+                Point(-1, 1),
+                Point(1, 1),
+                Point(1, -1),
+            ]
+        )
+        self._ignore_mask = np.zeros(len(self._normalized_points), dtype=bool)
         self._normalized_center = Point(0, 0)
         self._scale_x = 2 / size[0]
         self._scale_y = 2 / size[1]
@@ -70,17 +77,9 @@ class Window(GraphicObject):
             window_max: Point = None,
             clipping=None,
     ):
-        first_point, *others = self._normalized_points
-        new_first_point = viewport_transform(first_point)
-
-        for point in others:
-            end_point = viewport_transform(point)
-            super().draw_line(context, new_first_point, end_point)
-            new_first_point = end_point
-
-        new_end_point = viewport_transform(self._normalized_points[0])
-
-        super().draw_line(context, new_first_point, new_end_point)
+        corners = viewport_transform(self._normalized_points)
+        segments = np.stack((corners, np.roll(corners, -1, axis=0)), axis=1)
+        self.add_segments_to_path(context, segments)
 
     def scaling(self, factor: float):
         """
@@ -92,12 +91,11 @@ class Window(GraphicObject):
                 factor > 1      : zoom out
         """
         matrix = Transformation.get_scaling_about_point(
-            self._center, factor, factor, 1, self.rotation_matrix
+            self.center, factor, factor, 1, self.rotation_matrix
         )
-        self._points = Transformation.transform_points(self._points, matrix)
+        self.update_points(Transformation.transform_array(self._points, matrix))
         self._scale_x *= factor
         self._scale_y *= factor
-        self.compute_center()
 
     def zoom_in(self, amount: float = 0.05):
         self.scaling(1.0 + amount)
@@ -116,13 +114,13 @@ class Window(GraphicObject):
         """
 
         translate_back_from_origin = transform.get_translation_matrix(
-            self._center.x, self._center.y, self._center.z
+            self.center.x, self.center.y, self.center.z
         )
         rotate_again = self._rotation_matrix
         translate_amount = transform.get_translation_matrix(x, y, z)
         undo_rotation = self.inverse_rotation_matrix
         translate_back_to_origin = transform.get_translation_matrix(
-            -self._center.x, -self._center.y, -self._center.z
+            -self.center.x, -self.center.y, -self.center.z
         )
 
         matrix = (
@@ -133,8 +131,7 @@ class Window(GraphicObject):
                 @ translate_back_to_origin
         )
 
-        self._points = transform.transform_points(self._points, matrix)
-        self.compute_center()
+        self.update_points(transform.transform_array(self._points, matrix))
 
     def up(self, transform: Transformation, distance: float = 10):
         self.translate(transform, 0, distance)
@@ -156,7 +153,7 @@ class Window(GraphicObject):
 
     def rotation(self, x_angle: float, y_angle: float, z_angle: float):
         translation_back = Transformation.get_translation_matrix(
-            self._center.x, self._center.y, self._center.z
+            self.center.x, self.center.y, self.center.z
         )
 
         x_rad = np.deg2rad(x_angle)
@@ -165,16 +162,15 @@ class Window(GraphicObject):
 
         rotation = Transformation.get_rotation_matrix(x_rad, y_rad, z_rad)
         translation = Transformation.get_translation_matrix(
-            -self._center.x, -self._center.y, -self._center.z
+            -self.center.x, -self.center.y, -self.center.z
         )
 
         matrix = translation_back @ rotation @ translation
-        self._points = Transformation.transform_points(self._points, matrix)
-        self.compute_center()
+        self.update_points(Transformation.transform_array(self._points, matrix))
         self._rotation_matrix = rotation @ self._rotation_matrix
 
     def get_up_vector(self) -> Point:
-        return self._points[2] - self._points[3]
+        return self.get_point(2) - self.get_point(3)
 
     def get_rotation_angle(self) -> float:
         up_v = self.get_up_vector()
@@ -188,10 +184,14 @@ class ViewPort:
     _window: Window  # viewport precisa ter acesso à window
     _clipping_area: int
     _clipping_type: LineClippingType
+    _scale: np.ndarray | None  # coeficientes da transformada: device = normalizado * _scale + _offset
+    _offset: np.ndarray | None
 
     def __init__(
             self, size: tuple[int, int] = None, window: Window = None, area: float = 0.10
     ) -> None:
+        self._scale = None
+        self._offset = None
         if size and window:
             self._size = size
             self._window = window
@@ -201,26 +201,79 @@ class ViewPort:
     def window(self):
         return self._window
 
-    def transform(self, point: Point) -> Point:
-        w_points = self._window.normalized_points
-        max_w = w_points[2] + Point(self._clipping_area, self._clipping_area)
-        min_w = w_points[0] - Point(self._clipping_area, self._clipping_area)
+    @property
+    def scale(self) -> np.ndarray:
+        """Pixels por unidade normalizada, em x e y"""
+        if self._scale is None:
+            self.update()
+        return self._scale
+
+    def update(self):
+        """Recalcula os coeficientes da transformada de viewport (uma vez por quadro, depois da normalização)"""
+        max_w = self._window.normalized_points[2, :2] + self._clipping_area
+        min_w = self._window.normalized_points[0, :2] - self._clipping_area
+        width, height = self._size
+
+        scale_x = width / (max_w[0] - min_w[0])
+        scale_y = -height / (max_w[1] - min_w[1])  # o eixo y do dispositivo cresce para baixo
+        self._scale = np.array([scale_x, scale_y])
+        self._offset = np.array([-min_w[0] * scale_x, height - min_w[1] * scale_y])
+
+    def transform_array(self, points: np.ndarray) -> np.ndarray:
+        """
+        Leva um array (K, 2) (ou (K, 4)) de coordenadas normalizadas para um array (K, 2) de coordenadas do
+        dispositivo
+        """
+        if self._scale is None:
+            self.update()
+        return points[:, :2] * self._scale + self._offset
 
-        vp_x = (point.x - min_w.x) / (max_w.x - min_w.x) * (self._size[0])
-        vp_y = (1 - ((point.y - min_w.y) / (max_w.y - min_w.y))) * (self._size[1])
-        return Point(vp_x, vp_y)
+    def transform(self, point: Point) -> Point:
+        if self._scale is None:
+            self.update()
+        return Point(
+            point.x * self._scale[0] + self._offset[0],
+            point.y * self._scale[1] + self._offset[1],
+        )
 
 
 class DisplayFile:
+    DEVICE_PADDING = 3  # espessura da linha (2) + deslocamento do desenho de pontos (1)
+    # níveis de detalhe das curvas: a escala (pixels por unidade do mundo) é arredondada para 2 ** nível
+    MIN_LOD_LEVEL = -16
+    MAX_LOD_LEVEL = 16
+
     _objects: Dict[int, GraphicObject]
+    _scene: SceneBuffer  # pontos (do mundo e normalizados) de todos os objetos em arrays únicos
+    _index: SpatialIndex  # caixas envolventes dos objetos no mundo, para consultar o que está no campo de visão
+    _visible: list[GraphicObject] | None  # resultado da última consulta ao índice
+    _generation: int  # incrementada a cada mudança da janela (navegação)
+    _matrix_generation: int  # geração para a qual a matriz de normalização foi calculada
+    _scene_generation: int  # geração da última normalização da cena inteira
+    # objetos carregados sob demanda (fora do SceneBuffer, pontos do mundo em um arquivo mapeado em memória),
+    # com buffers normalizados alocados, do menos para o mais recentemente visível
+    _paged_in: OrderedDict[int, GraphicObject]
+    _paged_in_bytes: int
+    _memory_budget: int  # bytes de buffers normalizados dos objetos sob demanda
     _view_port: ViewPort
     _transformation: Transformation
     _clipping: Clipping
 
-    def __init__(self, view_port: ViewPort, transformation: Transformation) -> None:
+    def __init__(
+            self, view_port: ViewPort, transformation: Transformation, memory_budget: int = NORMALIZED_MEMORY_BUDGET
+    ) -> None:
         self._view_port = view_port
         self._transformation = transformation
         self._objects = {}
+        self._scene = SceneBuffer()
+        self._index = SpatialIndex()
+        self._visible = None
+        self._generation = 0
+        self._matrix_generation = -1
+        self._scene_generation = -1
+        self._paged_in = OrderedDict()
+        self._paged_in_bytes = 0
+        self._memory_budget = memory_budget
         self._clipping = Clipping(LineClippingType.LIANG_BARSKY)
         self.update_normalization()
 
@@ -272,100 +325,277 @@ class DisplayFile:
             case ObjectType.BSPLINE_SURFACE:
                 obj = BSplineSurface(name, new_input, color)
         self.add_object(obj)
-        self.normalize_object(obj)
         return obj.id
 
-    def add_object(self, obj: GraphicObject):
-        self.normalize_object(obj)
+    def add_object(self, obj: GraphicObject, lazy: bool = False, world_bbox: np.ndarray = None):
+        """
+        Args:
+            lazy: o objeto fica fora do SceneBuffer, com os pontos do mundo onde estão (por exemplo, uma view de
+                um arquivo mapeado em memória, ver SceneFileHandler), e só é normalizado quando estiver no campo
+                de visão. Os buffers normalizados desses objetos respeitam o orçamento de memória da cena.
+            world_bbox: caixa envolvente no mundo, se já for conhecida (evita ler todos os pontos)
+        """
         self._objects[obj.id] = obj
+        self._index.insert(obj.id, world_bbox if world_bbox is not None else obj.get_world_bbox())
+        self._visible = None
+        if lazy:
+            return
+        self._scene.add(obj)
+        self.normalize_object(obj)
 
-    @staticmethod
-    def project_point(point, cop_distance=1):
-        """Projeção em perspectiva"""
-        if point.z == 0 or point.z <= 0:
-            return Point(0, 0, 0, True)
-
-        return Point(point.x * cop_distance / point.z, point.y * cop_distance / point.z)
+    def is_lazy(self, obj: GraphicObject) -> bool:
+        return obj not in self._scene
+
+    def _make_resident(self, obj: GraphicObject):
+        """Copia os pontos de um objeto sob demanda para o SceneBuffer (antes de alterá-los)"""
+        if not self.is_lazy(obj):
+            return
+        if obj.id in self._paged_in:
+            del self._paged_in[obj.id]
+            self._paged_in_bytes -= obj.normalized_nbytes
+        self._scene.add(obj)
+        self.normalize_object(obj)
 
     def normalize_object(self, obj: GraphicObject):
-        new_points = Transformation.transform_points(
-            obj.points, self._transformation.normalizing_matrix
+        """Normaliza e projeta todos os pontos do objeto de uma vez, escrevendo no buffer normalizado do objeto"""
+        self._update_normalizing_matrix()
+        if not obj.has_normalized_buffers() and self.is_lazy(obj):
+            # o objeto é carregado: buffers normalizados e índices dos elementos, liberados juntos em _evict
+            obj.allocate_normalized_buffers()
+            obj.load_elements()
+            self._paged_in[obj.id] = obj
+            self._paged_in_bytes += obj.normalized_nbytes
+        normalized, ignore = self._transformation.normalize_array(
+            obj.points, obj.normalized_points, obj.ignore_mask
         )
-        projected_points = []
-        for p in new_points:
-            new_p = self.project_point(p)
-            if new_p:
-                projected_points.append(new_p)
+        obj.update_normalized_points(normalized, ignore)
+        obj.mark_normalized(self._generation)
 
-        obj.update_normalized_points(projected_points)
+    def is_normalized(self, obj: GraphicObject) -> bool:
+        """Se os pontos normalizados do objeto correspondem à janela atual"""
+        if obj.normalized_generation == self._generation:
+            return True
+        return self._scene_generation == self._generation and not self.is_lazy(obj)
 
     def transform_object(
             self, object_id: int, object_input: Dict[TransformationType, Any]
     ):
         graphic_object = self.get_object(object_id)
-        new_points = self.transformation.get_transformed_points(
+        self._make_resident(graphic_object)
+        matrix = self.transformation.get_transforming_matrix(
             graphic_object,
             object_input,
             window_rotation=self._view_port.window.rotation_matrix,
             window_center=self._view_port.window.center,
         )
-        graphic_object.update_points(new_points)
+        if isinstance(graphic_object, Curve):
+            graphic_object.update_control_points(
+                Transformation.transform_array(graphic_object.control_points, matrix)
+            )
+        new_points = Transformation.transform_array(graphic_object.points, matrix)
+        self._scene.update_points(graphic_object, new_points)
+        self._index.update(graphic_object.id, graphic_object.get_world_bbox())
+        self._visible = None
         self.normalize_object(graphic_object)
 
     def on_draw(self, context: cairo.Context):
-        self._view_port.window.draw(context, self._view_port.transform)
-        for obj in self._objects.values():
-            obj.draw(
-                context,
-                self._view_port.transform,
-                self._view_port.window.normalized_points[0],
-                self._view_port.window.normalized_points[2],
-                self._clipping,
-            )
+        self.update_level_of_detail()
+        self.update_normalization()
+        self._view_port.update()
+        window = self._view_port.window
+        window_min = window.get_normalized_point(0)
+        window_max = window.get_normalized_point(2)
+
+        # região a redesenhar (a área inteira ou só as regiões invalidadas, ver DrawingArea.invalidate)
+        region_x0, region_y0, region_x1, region_y1 = context.clip_extents()
+
+        # objetos agrupados por cor: cada cor é preenchida e traçada uma única vez
+        groups: Dict[tuple, list[tuple[GraphicObject, Clipping | None]]] = {}
+        for obj in self.get_visible_objects():
+            # aceitação/rejeição trivial pela caixa envolvente normalizada
+            bbox = obj.normalized_bbox.tolist()
+            if Clipping.box_outside(window_max, window_min, bbox):
+                continue
+            x0, y0, x1, y1 = self._get_device_bbox(obj)
+            if x1 < region_x0 or x0 > region_x1 or y1 < region_y0 or y0 > region_y1:
+                continue
+            clipping = None if Clipping.box_inside(window_max, window_min, bbox) else self._clipping
+            groups.setdefault(tuple(obj.color), []).append((obj, clipping))
+
+        context.set_line_width(2)
+        context.set_source_rgb(*window.color)
+        window.draw(context, self._view_port.transform_array)
+        context.stroke()
+
+        for color, objects in groups.items():
+            context.set_source_rgb(*color)
+            for obj, clipping in objects:
+                obj.fill(context, self._view_port.transform_array, window_min, window_max, clipping)
+            context.fill()
+            for obj, clipping in objects:
+                obj.draw(context, self._view_port.transform_array, window_min, window_max, clipping)
+            context.stroke()
+
+    def get_device_bounds(self, object_id: int) -> Tuple[int, int, int, int] | None:
+        """
+        Retângulo (x, y, largura, altura) que o objeto ocupa no dispositivo, com a janela atual,
+        ou None se o objeto não existir ou não tiver pontos
+        """
+        obj = self.get_object(object_id)
+        if obj is None or len(obj.points) == 0:
+            return None
+        if not self.is_normalized(obj):
+            self.normalize_object(obj)
+        x0, y0, x1, y1 = self._get_device_bbox(obj)
+        x, y = math.floor(x0), math.floor(y0)
+        return x, y, math.ceil(x1) - x, math.ceil(y1) - y
+
+    def _get_device_bbox(self, obj: GraphicObject) -> list[float]:
+        """Caixa envolvente (x0, y0, x1, y1) do objeto no dispositivo, com folga para a espessura das linhas"""
+        min_x, min_y, max_x, max_y = obj.normalized_bbox
+        corners = self._view_port.transform_array(np.array([[min_x, min_y], [max_x, max_y]]))
+        x0, y0 = corners.min(axis=0) - self.DEVICE_PADDING
+        x1, y1 = corners.max(axis=0) + self.DEVICE_PADDING
+        return [float(x0), float(y0), float(x1), float(y1)]
 
     def get_object(self, object_id: int) -> GraphicObject:
         return self._objects.get(object_id)
 
     def get_object_descriptors(self) -> list[ObjectDescriptor]:
-        return [obj.get_descriptor() for obj in self._objects.values()]
+        return list(self.iter_object_descriptors())
 
-    def update_normalization(self):
-        window = self._view_port.window
-        self._transformation.set_normalizing_matrix(window)
+    def iter_object_descriptors(self) -> Iterator[ObjectDescriptor]:
+        """Descritores criados um a um, para exportar sem manter a cena inteira duplicada em memória"""
         for obj in self._objects.values():
-            self.normalize_object(obj)
+            yield obj.get_descriptor()
+
+    def get_visible_objects(self) -> list[GraphicObject]:
+        """Objetos cujas caixas envolventes no mundo intersectam o volume de visualização atual"""
+        if self._visible is None:
+            self._update_normalizing_matrix()
+            window = self._view_port.window
+            planes = self._transformation.get_frustum_planes(
+                window.get_normalized_point(0), window.get_normalized_point(2)
+            )
+            self._visible = [self._objects[obj_id] for obj_id in self._index.query(planes)]
+        return self._visible
+
+    def update_level_of_detail(self):
+        """
+        Escolhe o nível de detalhe das curvas no campo de visão pela escala (pixels por unidade do mundo) no ponto
+        de controle mais próximo do centro de projeção, e troca a tesselação das que mudaram de nível.
+        """
+        curves = [obj for obj in self.get_visible_objects() if isinstance(obj, Curve)]
+        if not curves:
+            return
+        self._update_normalizing_matrix()
+        matrix = self._transformation.normalizing_matrix
+        # escala da normalização no plano xy, multiplicada pela distância do COP (a projeção divide por z)
+        scale = np.abs(self._view_port.scale).max() * np.linalg.norm(matrix[:2, :3], 2)
+        scale *= self._transformation.cop_distance
+
+        for curve in curves:
+            z = Transformation.transform_array(curve.control_points, matrix)[:, 2]
+            if len(curve.points) == 0 or len(z) == 0 or not np.all(np.isfinite(z)):
+                continue  # sem pontos ou com coordenadas inválidas: mantém a tesselação atual
+            nearest = z.min()
+            if nearest <= 0:  # a curva passa por trás do centro de projeção
+                level = self.MAX_LOD_LEVEL
+            else:
+                level = math.ceil(math.log2(max(scale / nearest, 2.0 ** self.MIN_LOD_LEVEL)))
+                level = min(level, self.MAX_LOD_LEVEL)
+            new_points = curve.set_lod_level(level)
+            if new_points is None:
+                continue
+            self._make_resident(curve)
+            self._scene.update_points(curve, new_points)
+            self._index.update(curve.id, curve.get_world_bbox())
+            self.normalize_object(curve)
+
+    def update_normalization(self):
+        """
+        Renormaliza os objetos no campo de visão que estão desatualizados em relação à janela atual.
+        Os demais são normalizados quando entrarem no campo de visão.
+        """
+        visible = self.get_visible_objects()
+        stale = [obj for obj in visible if not self.is_normalized(obj)]
+        resident = [obj for obj in stale if not self.is_lazy(obj)]
+        if resident:
+            if self._scene.normalize(self._transformation, resident):
+                self._scene_generation = self._generation
+            else:
+                for obj in resident:
+                    obj.mark_normalized(self._generation)
+
+        # objetos sob demanda: os pontos do mundo são lidos do arquivo só aqui, quando entram no campo de visão
+        for obj in stale:
+            if self.is_lazy(obj):
+                self.normalize_object(obj)
+        for obj in visible:
+            if obj.id in self._paged_in:
+                self._paged_in.move_to_end(obj.id)
+        self._evict(visible)
+
+    def _evict(self, visible: list[GraphicObject]):
+        """
+        Libera os buffers normalizados (e os índices dos elementos) dos objetos sob demanda menos recentemente
+        visíveis, até caber no orçamento
+        """
+        visible_ids = {obj.id for obj in visible}
+        for obj_id in list(self._paged_in):
+            if self._paged_in_bytes <= self._memory_budget:
+                break
+            if obj_id in visible_ids:  # os mais recentes estão no fim: só sobram objetos visíveis
+                break
+            obj = self._paged_in.pop(obj_id)
+            self._paged_in_bytes -= obj.normalized_nbytes
+            obj.release_normalized_buffers()
+            obj.release_elements()
+
+    def on_view_changed(self):
+        """
+        A janela mudou: só invalida a normalização atual. Os objetos são renormalizados sob demanda, no próximo
+        desenho, então vários eventos de navegação entre dois desenhos custam uma única renormalização.
+        """
+        self._generation += 1
+        self._visible = None
+
+    def _update_normalizing_matrix(self):
+        if self._matrix_generation != self._generation:
+            self._transformation.set_normalizing_matrix(self._view_port.window)
+            self._matrix_generation = self._generation
 
     def on_zoom_in(self):
         self._view_port.window.zoom_in()
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_zoom_out(self):
         self._view_port.window.zoom_out()
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_up(self):
         self._view_port.window.up(self._transformation)
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_left(self):
         self._view_port.window.left(self._transformation)
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_right(self):
         self._view_port.window.right(self._transformation)
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_down(self):
         self._view_port.window.down(self._transformation)
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_front(self):
         self._view_port.window.front(self._transformation)
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_back(self):
         self._view_port.window.back(self._transformation)
-        self.update_normalization()
+        self.on_view_changed()
 
     def on_rotate(
             self,
@@ -378,4 +608,4 @@ class DisplayFile:
             angle: window rotation angle in degrees
         """
         self._view_port.window.rotation(angle_x, angle_y, angle_z)
-        self.update_normalization()
+        self.on_view_changed()
@@ -40,6 +40,31 @@ class Validation:
                         "É necessário que um polígono possua mais que uma coordenada."
                     )
 
+    @staticmethod
+    def surface_control_points_input(control_points: List[list], object_type: ObjectType):
+        """Rede de pontos de controle retangular: (3n + 1) x (3m + 1) para Bézier, ao menos 4 x 4 para B-Spline"""
+        if len(control_points) == 0 or any(len(row) == 0 for row in control_points):
+            raise ValidationError("Nenhuma tupla foi encontrada.")
+
+        rows, columns = len(control_points), len(control_points[0])
+        if any(len(row) != columns for row in control_points):
+            raise ValidationError(
+                "É necessário que todas as linhas da superfície possuam a mesma quantidade de pontos."
+            )
+        match object_type:
+            case ObjectType.BEZIER_SURFACE:
+                if rows < 4 or columns < 4 or (rows - 1) % 3 != 0 or (columns - 1) % 3 != 0:
+                    raise ValidationError(
+                        "É necessário que uma superfície de Bézier possua (3n + 1) x (3m + 1) pontos de controle "
+                        f"(4 x 4, 4 x 7, 7 x 7, ...), mas foram recebidos {rows} x {columns}."
+                    )
+            case ObjectType.BSPLINE_SURFACE:
+                if rows < 4 or columns < 4:
+                    raise ValidationError(
+                        "É necessário que uma superfície B-Spline possua ao menos 4 x 4 pontos de controle, "
+                        f"mas foram recebidos {rows} x {columns}."
+                    )
+
     @staticmethod
     def object_transform_input(object_input: dict):
         """Aceita valores vazios, exceto para conjunto ângulo e ponto para tipo de rotação ao redor do ponto